@@ -48,6 +48,32 @@ ps.add_argument(
     "--vary_name", dest="vary_name", nargs=1, type=str,
     default=[dt_tm_str],
     help="Custom name for vary output")
+ps.add_argument(
+    "--vary_fmt", dest="vary_fmt", nargs=1, type=str, default=["txt"],
+    choices=["txt", "hdf5", "both"],
+    help=("Vary output format: per-channel text files, one HDF5 file, "
+          "or both"))
+ps.add_argument(
+    "--jobs", dest="jobs", nargs=1, type=int, default=[1],
+    help=("Number of processes over which to spread experiment realizations "
+          "or vary parameter sets"))
+ps.add_argument(
+    "--seed", dest="seed", nargs=1, type=int, default=[None],
+    help="Seed for the experiment realizations")
+ps.add_argument(
+    "--stream", action="store_true", dest="stream", default=False,
+    help=("Estimate the output spreads from streaming histograms rather "
+          "than storing every sample. Skips writing output.txt"))
+ps.add_argument(
+    "--hdf5", action="store_true", dest="hdf5", default=False,
+    help=("Also write the outputs to sensitivity.hdf5 in the experiment "
+          "directory"))
+ps.add_argument(
+    "--occ_interp", dest="occ_interp", nargs=3, type=float, default=None,
+    metavar=("TMIN", "TMAX", "NUM"),
+    help=("Interpolate photon occupation numbers from a table of NUM "
+          "log-spaced temperatures between TMIN and TMAX [K] rather than "
+          "evaluating every temperature exactly"))
 ps.add_argument(
     "--log_name", dest="log_name", nargs=1, type=str,
     default=[dt_str],
@@ -62,8 +88,11 @@ vary_file = os.path.join(this_path, 'config', 'paramsToVary.txt')
 log_file = os.path.join(this_path, 'log', ('log_%s.txt' % (args.log_name[0])))
 
 # Simulate experiment
-sim = sm.Simulation(log_file, sim_file, args.exp_dir)
+sim = sm.Simulation(
+    log_file, sim_file, args.exp_dir, args.jobs[0], args.seed[0],
+    args.stream, args.hdf5, args.occ_interp)
 if not args.vary:
     sim.simulate()
 else:
-    sim.vary_simulate(vary_file, args.vary_name[0], args.vary_tog)
+    sim.vary_simulate(
+        vary_file, args.vary_name[0], args.vary_tog, args.vary_fmt[0])
@@ -109,6 +109,34 @@ class Camera:
         """ Return parameter median value """
         return self._param_dict[param].get_med()
 
+    def param_key(self, param):
+        """
+        Return the parameter dict key for a parameter name or key,
+        or None if the parameter is not a camera parameter
+
+        Args:
+        param (str): name of parameter or param dict key
+        """
+        if param in self._param_dict.keys():
+            return param
+        return self._param_names.get(
+            param.replace(" ", "").strip().upper())
+
+    def resample_param(self, param):
+        """
+        Re-sample a single camera parameter, leaving the other sampled
+        values unchanged
+
+        Args:
+        param (str): param dict key
+        """
+        self._param_vals[param] = self._param_samp(self._param_dict[param])
+        return
+
+    def sampled_params(self):
+        """ Parameter objects sampled for each experiment realization """
+        return list(self._param_dict.values())
+
     # ***** Helper Methods *****
     def _check_dirs(self):
         """ Check that passed camera directory exists with a config dir """
@@ -244,4 +272,4 @@ class Camera:
         if self._nexp == 1:
             return param.get_med()
         else:
-            return param.sample(nsample=1)
+            return self.tel.exp.sim.sample(param)
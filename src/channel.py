@@ -5,6 +5,7 @@ import os
 
 # BoloCalc modules
 import src.band as bd
+import src.channelState as cs
 import src.detectorArray as da
 import src.observationSet as ob
 import src.parameter as pr
@@ -24,10 +25,13 @@ class Channel:
     band_mask (list): frequencies for which the band is defined
     elev_dict (dict): pixel elevation distribution for ObservationSet object
     det_dict (dict): detector-specific parameters for DetectorArray object
-    elem (list): sky, optics, and detector element names
-    emis (list): sky, optics, and detector element absorbtivities
-    tran (list): sky, optics, and detector element transmissions
-    temp (list): sky, optics, and detector element temperatures
+    elem (list): sky, optics, and detector element names, which are
+    the same for every observation and detector
+    elem_role (list): role of each element: 'sky', 'optic', 'stop'
+    (the aperture stop), or 'detector'
+    emis (np.array): sky, optics, and detector element absorbtivities
+    tran (np.array): sky, optics, and detector element transmissions
+    temp (np.array): sky, optics, and detector element temperatures
 
     Parents:
     cam (src.Camera): Camera object
@@ -59,6 +63,8 @@ class Channel:
         self._store_elev_dict()
         # Store frequencies to integrate over and detector band
         self._store_band()
+        # Element value buffers, allocated on the first evaluation
+        self._state = None
 
         # Store the detector array object
         self._log.log("Generating DetectorArray object in channel %s"
@@ -73,6 +79,8 @@ class Channel:
     def evaluate(self):
         """ Evaluate channel """
         self._log.log("Evaluating channel Band_ID '%s'" % (self.band_id))
+        # Draw from this channel's own streams if the plan calls for them
+        self.cam.tel.exp.sim.reseed_rngs(self._rng_key())
         # Generate parameter values
         self._store_param_vals()
         # Evaluate focal plane
@@ -114,8 +122,9 @@ class Channel:
         new_val (float): new value to set the parameter to
         """
         self._log.log(
-            "Changing channel '%s' parameter '%s' to new value '%s'"
-            % (self.param("ch_name"), str(param), str(new_val)))
+            "Changing channel Band_ID '%s' in camera %s parameter '%s' to "
+            "new value '%s'" % (self.band_id, self.cam.dir, str(param),
+                                str(new_val)))
         # Check if the parameter label is by name
         if (param not in self._param_dict.keys() and
            param not in self.det_dict.keys()):
@@ -157,7 +166,52 @@ class Channel:
                 "Unable to retrieve median value for parameter '%s' "
                 "in channel Band_ID = %s" % (str(param), str(self.band_id)))
 
+    def param_key(self, param):
+        """
+        Return the parameter dict key for a channel or detector parameter
+        name or key, or None if the parameter is not a channel parameter
+
+        Args:
+        param (str): name of parameter or param dict key
+        """
+        if param in self._param_dict.keys() or param in self.det_dict.keys():
+            return param
+        caps_param = param.replace(" ", "").strip().upper()
+        if caps_param in self._param_names.keys():
+            return self._param_names[caps_param]
+        return self._det_param_names.get(caps_param)
+
+    def resample_param(self, param):
+        """
+        Re-sample a single channel or detector parameter, leaving the
+        other sampled values unchanged
+
+        Args:
+        param (str): param dict key
+        """
+        if param in self._param_dict.keys():
+            self._param_vals[param] = self._param_samp(
+                self._param_dict[param])
+            self._param_vals["ndet"] = int(self.param("det_per_waf") *
+                                           self.param("waf_per_ot") *
+                                           self.param("ot"))
+        else:
+            self._param_vals[param] = self.det_dict[param].get_med()
+            self.det_arr.resample_param(param)
+        return
+
+    def sampled_params(self):
+        """ Parameter objects sampled for each experiment realization """
+        return list(self._param_dict.values())
+
     # ***** Helper Methods *****
+    def _rng_key(self):
+        """ Indices of this channel in the experiment """
+        tel = self.cam.tel
+        return (list(tel.exp.tels.values()).index(tel),
+                list(tel.cams.values()).index(self.cam),
+                list(self.cam.chs.values()).index(self))
+
     def _cam_param(self, param):
         """ Return parent camera parameter value """
         return self.cam.param(param)
@@ -167,7 +221,7 @@ class Channel:
         if self._nexp == 1:
             return param.get_med()
         else:
-            return param.sample(nsample=1)
+            return self.cam.tel.exp.sim.sample(param)
 
     def _store_param(self, name):
         """ Store src.Parameter objects for this channel """
@@ -341,23 +395,28 @@ class Channel:
         """ Calculate sky + optics + detector emiss/effic/temp arrays """
         # Load the calculated optical parameters
         elem, emis, tran, temp = self.cam.opt_chn.evaluate(self)
-        # Concatenate the elem/emiss/effic/temp arrays, sky to det
-        self.elem = np.array(
-            [[obs.elem[i][0] + elem + self.det_arr.dets[i].elem
-             for i in range(self._ndet)]
-             for obs in self._obs_set.obs_arr]).astype(np.str)
-        self.emis = np.array(
-            [[obs.emis[i] + emis + self.det_arr.dets[i].emis
-             for i in range(self._ndet)]
-             for obs in self._obs_set.obs_arr]).astype(np.float)
-        self.tran = np.array(
-            [[obs.tran[i] + tran + self.det_arr.dets[i].tran
-             for i in range(self._ndet)]
-             for obs in self._obs_set.obs_arr]).astype(np.float)
-        self.temp = np.array(
-            [[obs.temp[i] + temp + self.det_arr.dets[i].temp
-             for i in range(self._ndet)]
-             for obs in self._obs_set.obs_arr]).astype(np.float)
+        # Store the element names and roles once, sky to det
+        sky_elem = self._obs_set.obs_arr[0].elem
+        det_elem = self.det_arr.dets[0].elem
+        self.elem = sky_elem + elem + det_elem
+        self.elem_role = (
+            ["sky" for e in sky_elem] +
+            ["stop" if optic.stop else "optic"
+             for optic in self.cam.opt_chn.optics.values()] +
+            ["detector" for e in det_elem])
+        # Write the emiss/effic/temp values into the state buffers
+        dims = (len(self._obs_set.obs_arr), self._ndet, len(sky_elem),
+                len(elem), len(det_elem), len(self.freqs))
+        if self._state is None or not self._state.fits(*dims):
+            self._state = cs.ChannelState(*dims)
+        for n, obs in enumerate(self._obs_set.obs_arr):
+            self._state.store_sky(n, obs.emis, obs.tran, obs.temp)
+        self._state.store_optics(emis, tran, temp)
+        for i, det in enumerate(self.det_arr.dets):
+            self._state.store_det(i, det.emis, det.tran, det.temp)
+        self.emis = self._state.emis
+        self.tran = self._state.tran
+        self.temp = self._state.temp
         return
 
     def _store_band_index(self):
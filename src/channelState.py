@@ -0,0 +1,88 @@
+# Built-in modules
+import numpy as np
+
+
+class ChannelState:
+    """
+    ChannelState holds reusable emissivity, transmission, and temperature
+    buffers for a channel, each shaped (nobs, ndet, nelem, nfreq). Sky,
+    optics, and detector values are written into their element slices
+    on each realization.
+
+    Args:
+    nobs (int): number of observations
+    ndet (int): number of detectors
+    nsky (int): number of sky elements
+    nopt (int): number of optical elements
+    ndet_elem (int): number of detector elements
+    nfreq (int): number of frequencies
+
+    Attributes:
+    emis (np.array): element emissivities
+    tran (np.array): element transmissions
+    temp (np.array): element temperatures
+    """
+    def __init__(self, nobs, ndet, nsky, nopt, ndet_elem, nfreq):
+        # Element slices, sky to detector
+        self._sky = slice(0, nsky)
+        self._opt = slice(nsky, nsky + nopt)
+        self._det = slice(nsky + nopt, nsky + nopt + ndet_elem)
+
+        # Buffers
+        self.shape = (nobs, ndet, nsky + nopt + ndet_elem, nfreq)
+        self._nelems = (nsky, nopt, ndet_elem)
+        self.emis = np.empty(self.shape)
+        self.tran = np.empty(self.shape)
+        self.temp = np.empty(self.shape)
+
+    # ***** Public Methods *****
+    def fits(self, nobs, ndet, nsky, nopt, ndet_elem, nfreq):
+        """ Whether the buffers fit the passed dimensions """
+        return (self.shape[:2] == (nobs, ndet) and
+                self._nelems == (nsky, nopt, ndet_elem) and
+                self.shape[-1] == nfreq)
+
+    def store_sky(self, n, emis, tran, temp):
+        """
+        Store sky values for observation n
+
+        Args:
+        n (int): observation index
+        emis (array): emissivities shaped (ndet, nsky, nfreq)
+        tran (array): transmissions shaped (ndet, nsky, nfreq)
+        temp (array): temperatures shaped (ndet, nsky, nfreq)
+        """
+        self.emis[n, :, self._sky] = emis
+        self.tran[n, :, self._sky] = tran
+        self.temp[n, :, self._sky] = temp
+        return
+
+    def store_optics(self, emis, tran, temp):
+        """
+        Store optics values, which are shared by every observation
+        and detector
+
+        Args:
+        emis (array): emissivities shaped (nopt, nfreq)
+        tran (array): transmissions shaped (nopt, nfreq)
+        temp (array): temperatures shaped (nopt, nfreq)
+        """
+        self.emis[:, :, self._opt] = emis
+        self.tran[:, :, self._opt] = tran
+        self.temp[:, :, self._opt] = temp
+        return
+
+    def store_det(self, i, emis, tran, temp):
+        """
+        Store values for detector i, which are shared by every observation
+
+        Args:
+        i (int): detector index
+        emis (array): emissivities shaped (ndet_elem, nfreq)
+        tran (array): transmissions shaped (ndet_elem, nfreq)
+        temp (array): temperatures shaped (ndet_elem, nfreq)
+        """
+        self.emis[:, i, self._det] = emis
+        self.tran[:, i, self._det] = tran
+        self.temp[:, i, self._det] = temp
+        return
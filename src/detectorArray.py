@@ -1,3 +1,6 @@
+# Built-in modules
+import numpy as np
+
 # BoloCalc modules
 import src.detector as dt
 
@@ -14,6 +17,8 @@ class DetectorArray:
 
     Attributes:
     dets (list): list of src.Detector objects
+    bands (np.array): detector bands shaped (ndet, nfreq)
+    windows (np.array): top-hat detector windows shaped (ndet, nfreq)
     """
     def __init__(self, ch):
         # Store passed parameters
@@ -33,16 +38,146 @@ class DetectorArray:
         self._log.log(
             "Evaluating detector objects in DetectorArray for channel %s"
             % (self.ch.param("ch_name")))
+        # Draw the parameters for every detector at once
+        self._rng = self.ch.cam.tel.exp.sim.det_rng
+        samps = self._param_samps()
         # Sample the detector band if defined when evaluating detectors
         if self.ch.det_band is not None:
             if self._ndet == 1:
                 bands = self.ch.det_band.get_avg()
             else:
-                bands = self.ch.det_band.sample(nsample=self._ndet)
-            for det, band in zip(self.dets, bands):
-                det.evaluate(band)
+                bands = self.ch.det_band.sample(
+                    nsample=self._ndet, rng=self._rng)
         # Otherwise, simply evaluate the detectors
         else:
-            for det in self.dets:
-                det.evaluate()
+            bands = [None for n in range(self._ndet)]
+        for n, (det, band) in enumerate(zip(self.dets, bands)):
+            det.evaluate({k: v[n] for k, v in samps.items()}, band)
+        # Build the bands for every detector at once
+        self._store_bands(
+            None if self.ch.det_band is None else bands,
+            samps.get("bshift"))
+        for n, det in enumerate(self.dets):
+            det.store_band(
+                self.bands[n], self.windows[n],
+                None if self._bshift is None else self._bshift[n])
         return
+
+    def resample_param(self, param):
+        """
+        Re-sample a single detector parameter for every detector
+
+        Args:
+        param (str): detector param dict key
+        """
+        self._rng = self.ch.cam.tel.exp.sim.det_rng
+        samp = self._param_samp(self.ch.det_dict[param])
+        for n, det in enumerate(self.dets):
+            det.set_param(param, samp[n])
+        return
+
+    # ***** Helper Methods *****
+    def _param_samps(self):
+        """ Sample each detector parameter for every detector """
+        samps = {}
+        for k, param in self.ch.det_dict.items():
+            samps[k] = self._param_samp(param)
+        # Band center shifts for custom bands
+        bc_std = self.ch.det_dict["bc"].get_std()
+        if self.ch.param("cust") and isinstance(bc_std, float):
+            samps["bshift"] = self.ch.det_dict["bc"].sample(
+                nsample=self._ndet, max=np.inf, min=-np.inf, null=True,
+                rng=self._rng)
+            if self._ndet == 1:
+                samps["bshift"] = [samps["bshift"]]
+        return samps
+
+    def _param_samp(self, param):
+        """ Sample a detector parameter, one value per detector """
+        if self._ndet == 1:
+            samp = param.get_med()
+        else:
+            samp = self.ch.cam.tel.exp.sim.sample(
+                param, nsample=self._ndet, rng=self._rng)
+        # Store one value per detector
+        if np.ndim(samp) == 0:
+            samp = [samp for n in range(self._ndet)]
+        return samp
+
+    def _det_vals(self, param):
+        """ Return a detector parameter as an array over detectors """
+        return np.array([det.param(param) for det in self.dets])
+
+    def _store_bands(self, bands=None, bshift=None):
+        """
+        Store the bands and windows for every detector, shaped (ndet, nfreq)
+
+        Args:
+        bands (array): sampled custom bands shaped (ndet, nfreq). Defaults
+        to None, which uses top-hat bands.
+        bshift (array): sampled band center shifts. Defaults to None.
+        """
+        freqs = np.asarray(self.ch.freqs)
+        # Top-hat bands, from each detector's band edges and efficiency
+        det_eff = self._det_vals("det_eff")
+        if "NA" not in str(det_eff):
+            flo = self._det_vals("flo")[:, np.newaxis]
+            fhi = self._det_vals("fhi")[:, np.newaxis]
+            top_hat = np.where(
+                (freqs >= flo) * (freqs < fhi),
+                det_eff.astype(float)[:, np.newaxis], 0.)
+        else:
+            top_hat = None
+        self._bshift = None
+        # Use custom bands if "BAND" is passed for band center
+        if self.ch.param("cust"):
+            if bands is None:
+                self._log.err(
+                    "Band Center for channel '%s' defined as 'BAND' "
+                    "but no fand file found" % (self.ch.param("ch_name")))
+            bands = np.asarray(bands, dtype=float)
+            # Scale the band transmission to the sampled det_eff values
+            if top_hat is not None:
+                scale_fact = (np.trapz(top_hat, freqs) /
+                              np.trapz(bands, freqs))[:, np.newaxis]
+            else:
+                scale_fact = 1.
+            # Transmission must be between 0 and 1
+            self.bands = np.clip(scale_fact * bands, 0., 1.)
+            # Shift the band centers, filling with the edge values
+            if bshift is not None:
+                self._bshift = np.asarray(bshift, dtype=float)
+                self.bands = self._shift_bands(
+                    self.bands, np.round(
+                        self._bshift / np.diff(freqs)[0]).astype(int))
+            # Top-hat window for optical-power calculations
+            edges = np.array([self.ch.cam.tel.exp.sim.phys.band_edges(
+                freqs, band) for band in self.bands])
+            self.windows = (
+                (freqs >= edges[:, :1]) * (freqs < edges[:, 1:])).astype(
+                    float)
+        # Or store top-hat bands
+        else:
+            if top_hat is None:
+                self._log.err(
+                    "Neither 'Detector Eff' nor detector band defined for "
+                    "channel '%s' in camera '%s'"
+                    % (self.ch.name, self.ch.cam.dir))
+            self.bands = top_hat
+            # Top-hat window for optical-power calculations
+            self.windows = (top_hat != 0.).astype(float)
+        return
+
+    def _shift_bands(self, bands, delta_inds):
+        """
+        Shift each band by its number of frequency bins
+
+        Args:
+        bands (array): bands shaped (ndet, nfreq)
+        delta_inds (array): number of bins to shift each band by
+        """
+        nfreq = bands.shape[-1]
+        inds = np.clip(
+            np.arange(nfreq)[np.newaxis, :] - delta_inds[:, np.newaxis],
+            0, nfreq - 1)
+        return np.take_along_axis(bands, inds, axis=-1)
@@ -1,10 +1,12 @@
 # Built-in modules
 import numpy as np
 import itertools as it
+import h5py as hp
 import os
 
 # BoloCalc modules
 import src.unit as un
+import src.quantileSketch as qs
 
 
 class Display:
@@ -16,16 +18,39 @@ class Display:
         self._phys = self._sim.phys
         self._noise = self._sim.noise
         self._units = self._sim.output_units
+        # Output labels, shared by the text tables and the HDF5 file
+        self._sens_labs = [
+            "Optical Throughput", "Optical Power",
+            "Telescope Temp", "Sky Temp",
+            "Photon NEP", "Bolometer NEP",
+            "Readout NEP", "Detector NEP",
+            "Detector NET_CMB", "Detector NET_RJ",
+            "Array NET_CMB", "Array NET_RJ",
+            "Correlation Factor",
+            "CMB Map Depth", "RJ Map Depth"]
+        self._opt_labs = [
+            "Power from Sky", "Power to Detector", "Efficiency",
+            "Cumulative Efficiency"]
+        self._summary_labs = [
+            "Num Det", "Array NET_CMB", "Array NET_RJ",
+            "CMB Map Depth", "RJ Map Depth"]
+        # HDF5 results file, when requested
+        self._h5 = None
 
     # ***** Public Methods *****
     def display(self):
-        # Merge experiment realizations
-        self._merge_exps()
+        # Outputs of every experiment realization
+        self._res = self._sim.results
         # Generate table format
         self._table_format()
+        if self._sim.hdf5:
+            self._init_hdf5()
         # Write data
         self.sensitivity()
         self.opt_pow_tables()
+        if self._h5 is not None:
+            self._h5.close()
+            self._h5 = None
         return
 
     def sensitivity(self):
@@ -77,52 +102,6 @@ class Display:
         return
 
     # ***** Helper Methods *****
-    def _merge_exps(self):
-        # Loop over experiment realizations
-        self._sns = []
-        self._opts = []
-        nexp = len(self._sim.senses)
-        ntel = len(self._sim.senses[0])
-        for i in range(ntel):
-            sns_1 = []
-            opts_1 = []
-            ncam = len(self._sim.senses[0][i])
-            for j in range(ncam):
-                sns_2 = []
-                opts_2 = []
-                nch = len(self._sim.senses[0][i][j])
-                for k in range(nch):
-                    # Merge sensitivities
-                    sns_3 = []
-                    nparam = len(self._sim.senses[0][i][j][k])
-                    for m in range(nparam):
-                        sn_arrs = []
-                        opt_arrs = []
-                        for n in range(nexp):
-                            sn_arrs.append(
-                                self._sim.senses[n][i][j][k][m])
-                        sns_3.append(np.concatenate(sn_arrs).tolist())
-                    # Merge optical powers
-                    opts_3 = []
-                    nparam = len(self._sim.opt_pows[0][i][j][k])
-                    for m in range(nparam):
-                        opts_4 = []
-                        nopt = len(self._sim.opt_pows[0][i][j][k][m])
-                        for n in range(nopt):
-                            opt_arrs = []
-                            for p in range(nexp):
-                                opt_arrs.append(
-                                    self._sim.opt_pows[p][i][j][k][m][n])
-                            opts_4.append(np.concatenate(opt_arrs).tolist())
-                        opts_3.append(opts_4)
-                    sns_2.append(sns_3)
-                    opts_2.append(opts_3)
-                sns_1.append(sns_2)
-                opts_1.append(opts_2)
-            self._sns.append(sns_1)
-            self._opts.append(opts_1)
-        return
-
     def _table_format(self):
         # Camera sensitivity file
         self._title_cam = ("%-10s | %-7s | "
@@ -134,15 +113,7 @@ class Display:
                            "%-23s | %-23s | "
                            "%-23s | "
                            "%-23s | %-23s\n"
-                           % ("Chan", "Num Det",
-                              "Optical Throughput", "Optical Power",
-                              "Telescope Temp", "Sky Temp",
-                              "Photon NEP", "Bolometer NEP",
-                              "Readout NEP", "Detector NEP",
-                              "Detector NET_CMB", "Detector NET_RJ",
-                              "Array NET_CMB", "Array NET_RJ",
-                              "Correlation Factor",
-                              "CMB Map Depth", "RJ Map Depth"))
+                           % ("Chan", "Num Det", *self._sens_labs))
         self._unit_cam = ("%-10s | %-7s | %-23s | "
                           "%-23s | %-23s | %-23s | "
                           "%-23s | %-23s | %-23s | "
@@ -182,9 +153,7 @@ class Display:
         #                     % ("ArrNET", "ArrNETRJ", "MapDep"))+" | ")
         # Optical power files
         self._title_opt = ("| %-15s | %-26s | %-23s | %-23s | %-23s |\n"
-                           % ("Element", "Power from Sky",
-                              "Power to Detector", "Efficiency",
-                              "Cumulative Efficiency"))
+                           % ("Element", *self._opt_labs))
         self._unit_opt = ("| %-15s | %-26s | %-23s | %-23s | %-23s |\n"
                           % ("", "[pW]", "[pW]", "", ""))
         self._break_opt = "-"*126+"\n"
@@ -206,6 +175,7 @@ class Display:
         self._tel_f.write(self._break_tel)
         self._tel_f.write(self._unit_tel)
         self._tel_f.write(self._break_tel)
+        self._tel_path = "telescopes/%s" % (tel.name)
         return
 
     def _init_cam_table(self, cam):
@@ -216,23 +186,35 @@ class Display:
         self._cam_f.write(self._unit_cam)
         self._cam_f.write(self._break_cam)
         self._init_cam_output(cam)
+        self._cam_path = "%s/cameras/%s" % (self._tel_path, cam.name)
         return
 
     def _init_cam_output(self, cam):
+        # Raw samples are not kept when streaming
+        if self._sim.stream:
+            return
         self._cam_d = open(os.path.join(
             cam.dir, 'output.txt'), 'w+')
         return
 
     def _write_cam_table_row(self, ch, tup):
         # tup (i,j,k) = (tel,cam,ch) tuple
-        sns = self._sns[tup[0]][tup[1]][tup[2]]
-        # Convert from SI
-        sns = [list(self._units.values())[i].from_SI(np.array(sns[i]))
-               for i in range(len(sns))]
-        # Save the camera data
-        self._cam_data.append(sns)
-        # Calculate the spreads
-        spreads = [self._spread(sn) for sn in sns]
+        sns = [self._res.get(("sens",) + tup + (m,))
+               for m in range(len(self._units))]
+        if self._sim.stream:
+            # Calculate the spreads from the sketches
+            spreads = [self._spread(sn, unit) for sn, unit in zip(
+                sns, self._units.values())]
+        else:
+            # Convert from SI
+            sns = [unit.from_SI(sn) for sn, unit in zip(
+                sns, self._units.values())]
+            # Save the camera data
+            self._cam_data.append(sns)
+            # Calculate the spreads
+            spreads = [self._spread(sn) for sn in sns]
+        self._write_hdf5_ch(
+            ch, spreads, None if self._sim.stream else sns)
         # Values to be stored for combining at higher levels
         ch_name = ch.param("ch_name")
         ndet = ch.param("ndet")
@@ -280,7 +262,8 @@ class Display:
 
     def _write_opt_table(self, ch, tup):
         # tup (i,j,k) = (tel,cam,ch) tuple
-        opt = self._opts[tup[0]][tup[1]][tup[2]]
+        opt = [[self._res.get(("opt",) + tup + (n, m))
+                for m in range(len(ch.elem))] for n in range(4)]
         band_title = ("%s %11s_%-12s %s\n"
                       % ("*"*37, ch.cam.param("cam_name"),
                          ch.param("band_id"), "*"*37))
@@ -289,8 +272,8 @@ class Display:
         self._opt_f.write(self._break_opt)
         self._opt_f.write(self._unit_opt)
         self._opt_f.write(self._break_opt)
-        for m in range(len(ch.elem[0][0])):  # nelem
-            elem_name = ch.elem[0][0][m]
+        for m in range(len(ch.elem)):  # nelem
+            elem_name = ch.elem[m]
             wstr = ("| %-15s | %-6.3f +/- (%-6.3f,%6.3f) | "
                     "%-5.3f +/- (%-5.3f,%5.3f) | "
                     "%-5.3f +/- (%-5.3f,%5.3f) | "
@@ -305,6 +288,7 @@ class Display:
             self._opt_f.write(wstr)
             self._opt_f.write(self._break_opt)
         self._opt_f.write("\n\n")
+        self._write_hdf5_opt(ch, opt)
         return
 
     def _finish_cam_table(self):
@@ -334,6 +318,10 @@ class Display:
                    *tot_map_depth_rj))
         self._cam_f.write(wstr)
         self._cam_f.close()
+        self._write_hdf5_summary(
+            self._cam_path, ["Total"],
+            [[[tot_ndet, 0., 0.], tot_net_arr, tot_net_arr_rj,
+              tot_map_depth, tot_map_depth_rj]])
 
     def _write_output(self, fname, title_str, data_arr):
         # Write the title string
@@ -352,12 +340,15 @@ class Display:
         return
 
     def _write_cam_output(self):
+        if self._sim.stream:
+            return
         self._write_output(
             self._cam_d, self._title_cam_d, self._cam_data)
         return
 
-    def _write_tel_exp(self, val_dict, f):
+    def _write_tel_exp(self, val_dict, f, path="/"):
         # Store totals for the telescope / experiment
+        rows = []
         tot_det = 0
         tot_net_arr = []
         tot_net_arr_rj = []
@@ -390,6 +381,8 @@ class Display:
                        *map_depth_rj_ch))
             f.write(wstr)
             f.write(self._break_tel)
+            rows.append([[ndet_ch, 0., 0.], net_arr_ch, net_arr_rj_ch,
+                         map_depth_ch, map_depth_rj_ch])
             # Store totals
             tot_det += ndet_ch
             tot_net_arr.append(net_arr_ch)
@@ -417,10 +410,15 @@ class Display:
                    *map_depth_rj_tot))
         f.write(wstr)
         f.close()
+        rows.append([[tot_det, 0., 0.], net_arr_tot, net_arr_rj_tot,
+                     map_depth_tot, map_depth_rj_tot])
+        self._write_hdf5_summary(
+            path, list(val_dict.keys()) + ["Total"], rows)
         return
 
     def _write_tel_table(self):
-        return self._write_tel_exp(self._tel_vals, self._tel_f)
+        return self._write_tel_exp(
+            self._tel_vals, self._tel_f, self._tel_path)
 
     def _write_exp_table(self):
         return self._write_tel_exp(self._exp_vals, self._exp_f)
@@ -429,6 +427,93 @@ class Display:
         pct_lo, pct_hi = self._sim.param("pct")
         if unit is None:
             unit = un.Unit("NA")
-        lo, med, hi = unit.from_SI(np.percentile(
-            inp, (float(pct_lo), 50.0, float(pct_hi))))
+        pcts = (float(pct_lo), 50.0, float(pct_hi))
+        if isinstance(inp, qs.QuantileSketch):
+            lo, med, hi = unit.from_SI(inp.percentile(pcts))
+        else:
+            lo, med, hi = unit.from_SI(np.percentile(inp, pcts))
         return [med, abs(hi-med), abs(med-lo)]
+
+    def _init_hdf5(self):
+        """ Open the HDF5 results file and store the output labels """
+        self._h5 = hp.File(os.path.join(
+            self._sim.exp_dir, 'sensitivity.hdf5'), 'w')
+        str_dt = hp.string_dtype()
+        popt_unit = self._sim.std_params["POPT"].unit.name
+        for key, labs in [
+                ("params", self._sens_labs),
+                ("units", [unit.name for unit in self._units.values()]),
+                ("opt_params", self._opt_labs),
+                ("opt_units", [popt_unit, popt_unit, "NA", "NA"]),
+                ("summary_params", self._summary_labs),
+                ("columns", ["median", "hi - median", "median - lo"])]:
+            self._h5.attrs.create(key, labs, dtype=str_dt)
+        self._h5.attrs["pct"] = np.array(
+            self._sim.param("pct"), dtype=float)
+        self._h5.attrs["stream"] = self._sim.stream
+        return
+
+    def _hdf5_ch_path(self, ch):
+        """ HDF5 group path for a channel """
+        return "telescopes/%s/cameras/%s/channels/%s" % (
+            ch.cam.tel.name, ch.cam.name, ch.param("ch_name"))
+
+    def _write_hdf5_ch(self, ch, spreads, sns=None):
+        """
+        Write the sensitivity spreads and samples for a channel
+
+        Args:
+        ch (src.Channel): Channel object
+        spreads (list): (median, hi - median, median - lo) per output
+        sns (list): samples per output, converted from SI. Defaults to
+        None, which writes no samples.
+        """
+        if self._h5 is None:
+            return
+        grp = self._h5.require_group(self._hdf5_ch_path(ch))
+        grp.attrs["ndet"] = ch.param("ndet")
+        grp.create_dataset("spreads", data=np.array(spreads, dtype=float))
+        # Contiguous and uncompressed, so that readers can memory-map them
+        if sns is not None:
+            grp.create_dataset("samples", data=np.array(sns, dtype=float))
+        return
+
+    def _write_hdf5_opt(self, ch, opt):
+        """
+        Write the optical power spreads and samples for a channel
+
+        Args:
+        ch (src.Channel): Channel object
+        opt (list): samples per optical power column and element, in SI
+        """
+        if self._h5 is None:
+            return
+        grp = self._h5.require_group(self._hdf5_ch_path(ch))
+        grp.attrs.create("elements", list(ch.elem), dtype=hp.string_dtype())
+        units = [self._sim.std_params["POPT"].unit,
+                 self._sim.std_params["POPT"].unit, None, None]
+        grp.create_dataset("opt_spreads", data=np.array(
+            [[self._spread(elem, unit) for elem in col]
+             for col, unit in zip(opt, units)], dtype=float))
+        if not self._sim.stream:
+            grp.create_dataset("opt_samples", data=np.array(
+                [[elem if unit is None else unit.from_SI(elem)
+                  for elem in col] for col, unit in zip(opt, units)],
+                dtype=float))
+        return
+
+    def _write_hdf5_summary(self, path, rows, vals):
+        """
+        Write the summary rows of a camera, telescope, or experiment
+
+        Args:
+        path (str): HDF5 group path
+        rows (list): row labels
+        vals (list): spreads per row and summary parameter
+        """
+        if self._h5 is None:
+            return
+        grp = self._h5.require_group(path)
+        grp.create_dataset("summary", data=np.array(vals, dtype=float))
+        grp.attrs.create("rows", rows, dtype=hp.string_dtype())
+        return
@@ -17,6 +17,9 @@ class Distribution:
     Defaults to None
     max (float): maximum allowed value for the parameter.
     Defaults to None
+    alias (bool): whether to sample using an alias table, which draws
+    in constant time per sample. Defaults to None, which uses an alias
+    table for PDFs with more than 1000 values.
 
     Attributes:
     name (str): parameter name
@@ -24,9 +27,12 @@ class Distribution:
     val (array): values
     """
     def __init__(self, inp, std_param=None, name=None, unit=None,
-                 min=None, max=None):
+                 min=None, max=None, alias=None):
         # Store passed parameters
         self._inp = np.array(inp)
+        self._alias = alias
+        # PDF length above which to use an alias table by default
+        self._alias_min = 1000
 
         # Convert min and max to SI units
         if std_param is not None:
@@ -65,21 +71,34 @@ class Distribution:
             # Rescale probabilities to 1 in case they are not already
             self.prob = self.prob / np.sum(self.prob)
             self._cum = np.cumsum(self.prob)
+        # Alias table for large PDFs
+        if self._alias is None:
+            self._alias = (
+                self.prob is not None and len(self.prob) > self._alias_min)
+        if self._alias and self.prob is not None:
+            self._alias_prob, self._alias_ind = self._alias_table(self.prob)
+        else:
+            self._alias = False
 
     # ***** Public Methods *****
-    def sample(self, nsample=1):
+    def sample(self, nsample=1, rng=None):
         """
         Samle the distribution nsample times
 
         Args:
         nsample (int): the number of times to sample the distribution
+        rng (np.random.Generator): random number stream to draw from.
+        Defaults to None, which uses the global numpy stream.
         """
+        if rng is None:
+            rng = np.random
+        samps = np.asarray(self.val)[self._sample_inds(nsample, rng)]
         if nsample == 1:
-            samps = np.random.choice(self.val, size=nsample, p=self.prob)[0]
-        else:
-            samps = np.random.choice(self.val, size=nsample, p=self.prob)
-        samps = np.where(samps > self._max, self._max, samps)
-        samps = np.where(samps < self._min, self._min, samps)
+            samps = samps[0]
+        if self._max is not None:
+            samps = np.where(samps > self._max, self._max, samps)
+        if self._min is not None:
+            samps = np.where(samps < self._min, self._min, samps)
         return samps
     
     def change(self, new_avg):
@@ -129,3 +148,42 @@ class Distribution:
         else:
             lo, hi = np.percentile(self.val, [0.023, 0.977])
         return (hi-med, med-lo)
+
+    # ***** Helper Methods *****
+    def _sample_inds(self, nsample, rng):
+        """ Draw nsample indices into the value array """
+        nval = len(self.val)
+        # Uniform draws for value arrays without probabilities
+        if self.prob is None:
+            inds = (rng.random(nsample) * nval).astype(int)
+        # Alias-table draws
+        elif self._alias:
+            u = rng.random((2, nsample))
+            inds = (u[0] * nval).astype(int)
+            inds = np.where(
+                u[1] < self._alias_prob[inds], inds, self._alias_ind[inds])
+        # Inverse-CDF draws
+        else:
+            inds = np.searchsorted(
+                self._cum, rng.random(nsample), side="right")
+        return np.minimum(inds, nval - 1)
+
+    def _alias_table(self, prob):
+        """ Build a Vose alias table for the probabilities """
+        nval = len(prob)
+        scaled = prob * nval
+        alias_prob = np.ones(nval)
+        alias_ind = np.arange(nval)
+        small = list(np.flatnonzero(scaled < 1.))
+        large = list(np.flatnonzero(scaled >= 1.))
+        while small and large:
+            i_sm = small.pop()
+            i_lg = large.pop()
+            alias_prob[i_sm] = scaled[i_sm]
+            alias_ind[i_sm] = i_lg
+            scaled[i_lg] = scaled[i_lg] + scaled[i_sm] - 1.
+            if scaled[i_lg] < 1.:
+                small.append(i_lg)
+            else:
+                large.append(i_lg)
+        return alias_prob, alias_ind
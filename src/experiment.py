@@ -108,7 +108,7 @@ class Experiment:
         if self.sim.param("nexp"):
             return param.get_med()
         else:
-            return param.sample(nsample=1)
+            return self.sim.sample(param)
 
     def _store_param(self, name):
         """ Generate src.Parameter object and return it """
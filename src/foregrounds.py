@@ -1,3 +1,7 @@
+# Built-in modules
+import numpy as np
+
+
 class Foregrounds:
     """
     Foreground object contains the foreground parameters for the sky
@@ -16,6 +20,7 @@ class Foregrounds:
         freq (float): frequency at which to evaluate the physical temperature
         emiss (float): emissivity of the galactic dust. Default to 1.
         """
+        freq = np.asarray(freq, dtype=float)
         # Passed amplitude [W/(m^2 sr Hz)] converted from [MJy]
         amp = emiss * self._param("dust_amp")
         # Frequency scaling
@@ -51,6 +56,7 @@ class Foregrounds:
         freq (float): frequency at which to evaluate the spectral radiance
         emiss (float): emissivity of the synchrotron radiation. Default to 1.
         """
+        freq = np.asarray(freq, dtype=float)
         # Passed brightness temp [K_RJ]
         bright_temp = emiss * self._param("sync_amp")
         # Frequency scaling (freq / sync_freq)**sync_ind
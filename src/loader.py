@@ -4,6 +4,7 @@ import glob as gb
 import os
 
 # BoloCalc modules
+import src.band as bd
 import src.distribution as ds
 
 
@@ -22,6 +23,10 @@ class Loader:
         self._opt_dir = "Optics"
         self._det_dir = "Detectors"
         self._ftypes = ["CSV", "TXT"]
+        # Parsed band files, keyed by (path, mtime)
+        self._band_cache = {}
+        # Interpolated Band objects, keyed by (path, mtime, freq grid)
+        self._band_interp_cache = {}
 
     # ***** Public methods *****
     def sim(self, fname):
@@ -60,12 +65,31 @@ class Loader:
         Args:
         fname (str): band file name
         """
-        if ".CSV" in fname.upper():
-            return self._csv(fname)
-        elif ".TXT" in fname.upper():
-            return self._txt(fname)
-        else:
-            self._log.err("Illegal file format passed to Loader.band()")
+        key = self._file_key(fname)
+        if key not in self._band_cache:
+            if ".CSV" in fname.upper():
+                self._band_cache[key] = self._csv(fname)
+            elif ".TXT" in fname.upper():
+                self._band_cache[key] = self._txt(fname)
+            else:
+                self._log.err("Illegal file format passed to Loader.band()")
+        # Return a copy so that callers can't modify the cached data
+        return np.array(self._band_cache[key])
+
+    def band_interp(self, fname, freqs):
+        """
+        Return a Band object for a band file interpolated to the passed
+        frequencies, which is shared by every caller with the same grid
+
+        Args:
+        fname (str): band file name
+        freqs (np.array): frequencies [Hz] to interpolate the band to
+        """
+        key = self._file_key(fname) + (len(freqs), freqs[0], freqs[-1])
+        if key not in self._band_interp_cache:
+            self._band_interp_cache[key] = bd.Band(
+                self._log, self, fname, freqs)
+        return self._band_interp_cache[key]
 
     def optics_bands(self, inp_dir):
         """
@@ -227,6 +251,11 @@ class Loader:
                 for i in range(len(params))}
 
     # ***** Helper methods *****
+    def _file_key(self, fname):
+        """ Cache key for a file, which changes when the file is modified """
+        path = os.path.abspath(fname)
+        return (path, os.path.getmtime(path))
+
     def _csv(self, fname):
         return np.loadtxt(fname, unpack=True, dtype=np.float, delimiter=',')
 
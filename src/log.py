@@ -21,6 +21,8 @@ class Log:
         # Error preamble
         self._err_preamble = "BoloCalc ERROR: "
         self._wrn_preamble = "BoloCalc WARNING: "
+        # Messages collected rather than written, when not None
+        self._buf = None
 
         # Announce the beginning of logging
         self._f.write(
@@ -50,7 +52,7 @@ class Log:
         msg (str): message to log
         """
         self._write(msg)
-        sy.stdout.write(msg+"\n"),
+        self._echo("out", msg)
         return
 
     def err(self, msg):
@@ -73,13 +75,60 @@ class Log:
         """
         wrn_msg = self._wrn_preamble + msg
         self._write(wrn_msg)
-        sy.stderr.write(wrn_msg+"\n"),
+        self._echo("err", wrn_msg)
+        return
+
+    def flush(self):
+        """ Flush the log file """
+        if self._buf is None:
+            self._f.flush()
+        return
+
+    def buffer(self):
+        """
+        Collect messages rather than writing them, such as in a forked
+        worker process, which must not write to its parent's log file
+        """
+        self._buf = []
+        return
+
+    def drain(self):
+        """ Return and clear the collected messages """
+        msgs = self._buf
+        self._buf = []
+        return msgs
+
+    def replay(self, msgs):
+        """
+        Write messages collected by another Log, such as a worker's
+
+        Args:
+        msgs (list): messages returned by drain()
+        """
+        for dest, msg in msgs:
+            if dest == "log":
+                self._f.write(msg)
+            else:
+                self._echo(dest, msg)
         return
 
     # ***** Private methods *****
     def _write(self, msg):
         """ Write message to log file """
-        self._f.write(self._dt_msg(msg))
+        if self._buf is not None:
+            self._buf.append(("log", self._dt_msg(msg)))
+        else:
+            self._f.write(self._dt_msg(msg))
+        return
+
+    def _echo(self, dest, msg):
+        """ Write message to stdout ('out') or stderr ('err') """
+        if self._buf is not None:
+            self._buf.append((dest, msg))
+        elif dest == "out":
+            sy.stdout.write(msg+"\n")
+        else:
+            sy.stderr.write(msg+"\n")
         return
 
     def _dt_msg(self, msg):
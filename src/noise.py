@@ -1,5 +1,6 @@
 # Built-in modules
 import numpy as np
+import collections as cl
 import pickle as pk
 import os
 import io
@@ -19,9 +20,6 @@ class Noise:
         # Store passed parameters
         self._phys = phys
 
-        # Aperture stop names
-        self._ap_names = ["APERT", "STOP", "LYOT"]
-
         # Correlation files
         corr_dir = os.path.join(
             os.path.split(__file__)[0], "detCorrFiles", "PKL")
@@ -38,11 +36,18 @@ class Noise:
             os.path.join(corr_dir, "incoherentStopCorr.pkl"), "rb"),
                             encoding="latin1")
 
-        # Detector pitch array
-        self._det_p = self._p_c_apert
+        # Detector pitch array, which is sorted in increasing order
+        self._det_p = np.array(self._p_c_apert)
+        # Absolute correlation coefficients vs detector pitch
+        self._abs_c_apert = abs(np.array(self._c_apert))
+        self._abs_c_stop = abs(np.array(self._c_stop))
         # Geometric pitch factor
         self._geo_fact = 6  # Hex packing
 
+        # Correlation factors memoized per (elements, pitch)
+        self._corr_memo = cl.OrderedDict()
+        self._corr_memo_max = 128
+
     def Flink(self, n, Tb, Tc):
         """
         Link factor for the bolo to the bath
@@ -68,78 +73,65 @@ class Noise:
         return (psat * (n + 1) * (Tc**n) /
                 ((Tc**(n + 1)) - (Tb**(n + 1))))
 
-    def corr_facts(self, elems, det_pitch, flamb_max=3.):
+    def corr_facts(self, elems, roles, det_pitch, flamb_max=3.):
         """
         Calculate the Bose white-noise correlation factor
 
+        Factors are cached for each set of elements and detector pitch
+
         Args:
         elems (list): optical elements in the camera
+        roles (list): role of each element, as in src.Channel.elem_role
         det_pitch (float): detector pitch in f-lambda units
         flamb_max (float): the maximum detector pitch distance
         for which to calculate the correlation factor.
         Default is 3.
         """
-        ndets = int(round(flamb_max / (det_pitch), 0))
-        inds1 = [np.argmin(abs(np.array(self._det_p) -
-                 det_pitch * (n + 1)))
-                 for n in range(ndets)]
-        inds2 = [np.argmin(abs(np.array(self._det_p) -
-                 det_pitch * (n + 1) * np.sqrt(3.)))
-                 for n in range(ndets)]
-        inds = np.sort(inds1 + inds2)
-        c_apert = np.sum([abs(self._c_apert)[ind] for ind in inds])
-        i_apert = np.sum([abs(self._c_apert)[ind] for ind in inds])
-        i_stop = np.sum([abs(self._c_stop)[ind] for ind in inds])
-        c_apert = np.sqrt(c_apert*self._geo_fact + 1.)
-        i_apert = np.sqrt(i_apert*self._geo_fact + 1.)
-        i_stop = np.sqrt(i_stop*self._geo_fact + 1.)
-        at_det = False
-        factors = []
-        for i in range(len(elems)):
-            if "CMB" in elems[i]:
-                factors.append(c_apert)
-            elif elems[i].upper() in self._ap_names:
-                factors.append(i_stop)
-                at_det = True
-            elif not at_det:
-                factors.append(i_apert)
-            else:
-                factors.append(1.)
-        # return np.array(factors[:-1])
-        return np.array(factors)
+        key = (tuple(str(elem) for elem in elems), tuple(roles),
+               float(det_pitch), float(flamb_max))
+        if key in self._corr_memo:
+            self._corr_memo.move_to_end(key)
+        else:
+            self._corr_memo[key] = np.array(self._corr_facts(*key))
+            while len(self._corr_memo) > self._corr_memo_max:
+                self._corr_memo.popitem(last=False)
+        return self._corr_memo[key]
 
-    def photon_NEP(self, popts, freqs, elems=None, det_pitch=None):
+    def photon_NEP(self, popts, freqs, elems=None, det_pitch=None,
+                   roles=None):
         """
         Calculate photon NEP [W/rtHz] for a detector
 
+        The power spectra can carry leading dimensions, such as
+        (nobs, ndet, nelem, nfreq), in which case the NEPs are returned
+        with the leading shape, such as (nobs, ndet)
+
         Args:
         popts (list): power from elements in the optical elements [W]
         freqs (list): frequencies of observation [Hz]
         elems (list): optical elements
         det_pitch (float): detector pitch in f-lambda units. Default is None.
-        """
-        popt = sum([x for x in popts])
+        roles (list): role of each element, as in src.Channel.elem_role.
+        Default is None.
+        """
+        popts = np.asarray(popts)
+        popt = np.sum(popts, axis=-2)
+        # Sum_ij p_i * p_j = (Sum_i p_i)^2
+        popt2 = popt**2
+        nep = np.sqrt(np.trapz(
+            (2. * self._phys.h * freqs * popt + 2. * popt2), freqs))
         # Don't consider correlations
         if elems is None and det_pitch is None:
-            popt2 = sum([x*y for x in popts for y in popts])
-            nep = np.sqrt(np.trapz(
-                (2. * self._phys.h * freqs * popt + 2. * popt2), freqs))
             neparr = nep
-            return nep, neparr
         # Consider correlations
         else:
-            factors = self.corr_facts(elems, det_pitch)
-            popt2 = sum([popts[i] * popts[j]
-                         for i in range(len(popts))
-                         for j in range(len(popts))])
-            popt2arr = sum([factors[i] * factors[j] * popts[i] * popts[j]
-                            for i in range(len(popts))
-                            for j in range(len(popts))])
-            nep = np.sqrt(np.trapz(
-                (2. * self._phys.h * freqs * popt + 2. * popt2), freqs))
+            factors = self.corr_facts(elems, roles, det_pitch)
+            # Sum_ij f_i * f_j * p_i * p_j = (Sum_i f_i * p_i)^2
+            popt2arr = np.sum(
+                factors[:, np.newaxis] * popts, axis=-2)**2
             neparr = np.sqrt(np.trapz(
                 (2. * self._phys.h * freqs * popt + 2. * popt2arr), freqs))
-            return nep, neparr
+        return nep, neparr
 
     def bolo_NEP(self, flink, G, Tc):
         """
@@ -212,3 +204,40 @@ class Noise:
         return np.sqrt(
             (4. * self._phys.PI * fsky * 2. * np.power(net_arr, 2.)) /
             (tobs * obs_eff)) * (10800. / self._phys.PI)
+
+    # ***** Helper Methods *****
+    def _corr_facts(self, elems, roles, det_pitch, flamb_max):
+        """ Calculate correlation factors for a tuple of elements """
+        ndets = int(round(flamb_max / (det_pitch), 0))
+        rings = det_pitch * np.arange(1, ndets + 1)
+        inds = np.sort(np.concatenate((
+            self._nearest_pitch_inds(rings),
+            self._nearest_pitch_inds(rings * np.sqrt(3.)))))
+        c_apert = np.sum(self._abs_c_apert[inds])
+        i_apert = np.sum(self._abs_c_apert[inds])
+        i_stop = np.sum(self._abs_c_stop[inds])
+        c_apert = np.sqrt(c_apert*self._geo_fact + 1.)
+        i_apert = np.sqrt(i_apert*self._geo_fact + 1.)
+        i_stop = np.sqrt(i_stop*self._geo_fact + 1.)
+        at_det = False
+        factors = []
+        for i in range(len(elems)):
+            if "CMB" in elems[i]:
+                factors.append(c_apert)
+            elif roles[i] == "stop":
+                factors.append(i_stop)
+                at_det = True
+            elif not at_det:
+                factors.append(i_apert)
+            else:
+                factors.append(1.)
+        return tuple(factors)
+
+    def _nearest_pitch_inds(self, pitches):
+        """ Indices of the tabulated detector pitches nearest to pitches """
+        inds = np.clip(
+            np.searchsorted(self._det_p, pitches), 1, len(self._det_p) - 1)
+        # Choose the lower neighbor on ties, as np.argmin() would
+        lower = (
+            (pitches - self._det_p[inds - 1]) <= (self._det_p[inds] - pitches))
+        return inds - lower.astype(int)
@@ -12,10 +12,10 @@ class Observation:
     obs_set (src.ObservationSet): parent ObservationSet object
 
     Attributes:
-    elem (list): sky element names
-    emis (list): sky element absorbtivities
-    tran (list): sky element transmissions
-    temp (list): sky element temperatures
+    elem (list): sky element names, which are the same for every detector
+    emis (np.array): sky element absorbtivities
+    tran (np.array): sky element transmissions
+    temp (np.array): sky element temperatures
 
     Parents:
     obs_set (src.ObservationSet): ObservationSet object
@@ -30,36 +30,36 @@ class Observation:
         self._det_arr = self._ch.det_arr
         self._ndet = self._ch.cam.tel.exp.sim.param("ndet")
 
-    def evaluate(self):
-        """ Evaluate the observation's elem, emiss, tran, and temp arrays """
+    def evaluate(self, sky_temp, pwv, tel_elev, pix_elev=None):
+        """
+        Evaluate the observation's elem, emiss, tran, and temp arrays
+
+        Args:
+        sky_temp (float): sampled sky temperature
+        pwv (float): sampled PWV
+        tel_elev (float): sampled telescope elevation
+        pix_elev (array): sampled pixel elevations w.r.t. the boresight,
+        one per detector. Default is None, which is used when ndet = 1.
+        """
         # Store PWV and elevation
-        self._get_temp_pwv_elev()
+        self._get_temp_pwv_elev(sky_temp, pwv, tel_elev, pix_elev)
 
         # Store sky values
-        elem, emis, tran, temp = self._get_sky_vals()
-        self.elem = np.transpose(np.squeeze(elem, axis=1), (0, 2, 1)).tolist()
-        self.emis = np.squeeze(emis, axis=1).tolist()
-        self.tran = np.squeeze(tran, axis=1).tolist()
-        self.temp = np.squeeze(temp, axis=1).tolist()
+        self.elem, self.emis, self.tran, self.temp = self._get_sky_vals()
         return
 
     # ***** Helper Methods *****
-    def _get_temp_pwv_elev(self):
-        """ Sample the pixel elevation """
-        # Sample sky temperature
-        self._sky_temp = self._tel.sky_temp_sample()
-        # Sample PWV
-        self._pwv = self._sky.pwv_sample()
-        # Sample telescope elevation
-        tel_elev = self._scn.elev_sample()
+    def _get_temp_pwv_elev(self, sky_temp, pwv, tel_elev, pix_elev):
+        """ Store the sky temperature, PWV, and pixel elevations """
+        self._sky_temp = sky_temp
+        self._pwv = pwv
         # Retrieve camera boresight elevation
         cam_elev = self._obs_set.ch.cam.param("bore_elev")
-        # Sample pixel elevation
+        # Pixel elevation
         bore_elev = tel_elev + cam_elev
         if self._ndet == 1:
             self._pix_elev = [bore_elev]
         else:
-            pix_elev = self._obs_set.sample_pix_elev(self._ndet)
             self._pix_elev = pix_elev + bore_elev
         # Maximum allowed elevation = 90 deg, minimum = 20 deg
         self._pix_elev = np.array([e if e > self._scn.min_elev
@@ -71,7 +71,14 @@ class Observation:
         return
 
     def _get_sky_vals(self):
-        """ Get the sky values """
-        return np.hsplit(np.array([self._sky.evaluate(
+        """ Get the sky element names and the sky values """
+        # The sky only depends on the elevation rounded to the ATM grid,
+        # so evaluate each unique rounded elevation once
+        elevs, inds = np.unique(
+            np.round(self._pix_elev), return_inverse=True)
+        vals = [self._sky.evaluate(
             self._sky_temp, self._pwv, elev, self._ch.freqs)
-            for elev in self._pix_elev]), 4)
+            for elev in elevs]
+        # Element names are the same for every elevation
+        return [vals[0][0]] + [
+            np.array([val[k] for val in vals])[inds] for k in range(1, 4)]
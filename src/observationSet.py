@@ -24,6 +24,8 @@ class ObservationSet:
         self.ch = ch
         self._log = self.ch.cam.tel.exp.sim.log
         self._nobs = ch.cam.tel.exp.sim.param("nobs")
+        self._ndet = ch.cam.tel.exp.sim.param("ndet")
+        self._sim = ch.cam.tel.exp.sim
 
         # Store the elevation values and probabilities
         self._log.log(
@@ -49,16 +51,32 @@ class ObservationSet:
         self._log.log(
             "Evaluating observation objects in ObservationSet for channel %s"
             % (self.ch.param("ch_name")))
+        # Draw the samples for every observation at once
+        tel = self.ch.cam.tel
+        samps = [tel.sky_temp_sample(self._nobs),
+                 tel.sky.pwv_sample(self._nobs),
+                 tel.scn.elev_sample(self._nobs)]
+        if self._nobs == 1:
+            samps = [[samp] for samp in samps]
+        if self._ndet == 1:
+            pix_elevs = [None for n in range(self._nobs)]
+        else:
+            pix_elevs = self.sample_pix_elev((self._nobs, self._ndet))
         # Evaluate observations
-        for obs in self.obs_arr:
-            obs.evaluate()
+        for n, obs in enumerate(self.obs_arr):
+            obs.evaluate(samps[0][n], samps[1][n], samps[2][n], pix_elevs[n])
         return
 
     def sample_pix_elev(self, nsamp=1):
-        """ Sample pixel elevation w.r.t. its camera's boresight """
+        """
+        Sample pixel elevation w.r.t. its camera's boresight
+
+        Args:
+        nsamp (int or tuple): number or shape of samples. Default is 1.
+        """
         # Sample pixel elevation w.r.t. boresight distribution if defined
         if self._elev_vals is not None and self._elev_frac is not None:
-            return np.random.choice(
+            return self._sim.obs_rng.choice(
                 self._elev_vals, size=nsamp,
                 p=self._elev_frac / float(np.sum(self._elev_frac)))
         # Otherwise, return 0 deg
@@ -1,10 +1,10 @@
 # Built-in modules
 import numpy as np
+import collections as cl
 import os
 
 # BoloCalc modules
 import src.parameter as pr
-import src.band as bd
 
 
 class Optic:
@@ -19,6 +19,7 @@ class Optic:
 
     Attributes:
     name (str): optical element name
+    stop (bool): whether this optic is the aperture stop
 
     Parents:
     opt_chn (src.OpticalChain): OpticalChain object
@@ -46,6 +47,10 @@ class Optic:
                             "SPILLOVER",
                             "SCATTERFRAC"]
 
+        # Calculated spectra memoized per (sampled params, freq grid)
+        self._calc_memo = cl.OrderedDict()
+        self._calc_memo_max = 64
+
         # Store parameter dict
         self._store_param_dict()
         # Store bands
@@ -68,8 +73,18 @@ class Optic:
         # Name, which comes from a tuple ('elem', None)
         self._elem = self._param_vals["elem"]
         self.name = self._elem
+        self.stop = self._elem.strip().upper() in self._ap_names
         self._nfreq = len(self._ch.freqs)
 
+        # Unchanged optics reuse their previously calculated spectra
+        key = self._calc_key()
+        if key is not None and key in self._calc_memo:
+            self._calc_memo.move_to_end(key)
+            self._emiss, self._effic, self._temp, ap = self._calc_memo[key]
+            if ap is not None:
+                self._store_ap(*ap)
+            return (self._elem, self._emiss, self._effic, self._temp)
+
         self._store_temp()
         self._store_refl()
         self._store_spill()
@@ -79,6 +94,13 @@ class Optic:
         self._store_abso()
         self._calculate()
 
+        # Memoize the calculated spectra
+        if key is not None:
+            self._calc_memo[key] = (
+                self._emiss, self._effic, self._temp, self._ap)
+            while len(self._calc_memo) > self._calc_memo_max:
+                self._calc_memo.popitem(last=False)
+
         return (self._elem, self._emiss, self._effic, self._temp)
 
     def get_param(self, param, band_ind=None):
@@ -125,18 +147,47 @@ class Optic:
                 "Parameter '%s' not understood by Optic.change_param()"
                 % (str(param)))
 
+    def sampled_params(self):
+        """ Parameter objects sampled for each channel and realization """
+        return list(self._param_dict.values())
+
     # ***** Helper Methods *****
     def _pow_frac(self, T1, T2, freqs):
         """ Fractional power between two physical temperatures """
         return (self._phys.bb_pow_spec(freqs, T1) /
                 self._phys.bb_pow_spec(freqs, T2))
 
+    def _calc_key(self):
+        """
+        Key identifying the calculated spectra, which depend only on the
+        sampled parameters and the channel's frequency grid. Returns None
+        when a band file is sampled, which must be re-drawn every time.
+        """
+        if self._nexp != 1 and any(
+                str(self._param_dict[k].get_avg()).upper() == "BAND"
+                for k in ["refl", "spill", "scatf", "abs"]):
+            return None
+        freqs = self._ch.freqs
+        key = (self._ch.band_ind, len(freqs), freqs[0], freqs[-1]) + tuple(
+            self._hashable(self._param_vals[k])
+            for k in sorted(self._param_vals.keys()))
+        # Aperture spill efficiency also depends on the channel
+        key += tuple(self._hashable(self._ch.param(k))
+                     for k in ["pix_sz", "fnum", "wf"])
+        return key
+
+    def _hashable(self, val):
+        """ Convert a sampled value into a hashable key entry """
+        if isinstance(val, (list, np.ndarray)):
+            return tuple(np.ravel(val).tolist())
+        return val
+
     def _param_samp(self, param, band_ind):
         """ Sample optic parameter for given band """
         if self._nexp == 1:
             return param.get_med(band_ind=band_ind)
         else:
-            return param.sample(band_ind=band_ind, nsample=1)
+            return self._cam.tel.exp.sim.sample(param, band_ind=band_ind)
 
     def _store_param(self, name):
         """ Store Parameter objects for this optic """
@@ -352,8 +403,16 @@ class Optic:
             ch_eff = (np.trapz(self._effic, self._ch.freqs) /
                       float(self._ch.freqs[-1] - self._ch.freqs[0]))
             ch_taper = self._phys.edge_taper(ch_eff)
-            self._ch.set_param("ap_eff", ch_eff)
-            self._ch.set_param("edge_tap", ch_taper)
+            self._store_ap(ch_eff, ch_taper)
+        else:
+            self._ap = None
+        return
+
+    def _store_ap(self, ch_eff, ch_taper):
+        """ Store the aperture efficiency and edge taper at the channel """
+        self._ap = (ch_eff, ch_taper)
+        self._ch.set_param("ap_eff", ch_eff)
+        self._ch.set_param("edge_tap", ch_taper)
         return
 
     def _phys_lims(self, band):
@@ -368,14 +427,14 @@ class Optic:
         elem = self._param_vals["elem"]
         if key in self._band_dict.keys():
             band_f = self._band_dict[key]
-            load_band = bd.Band(self._log, self._load,
-                                band_f, self._ch.freqs)
+            load_band = self._load.band_interp(band_f, self._ch.freqs)
             # Sample the band if number of experiment realizations
             # is greater than one; otherwise, get the average band
             if self._nexp == 1:
                 samp_band = load_band.get_avg()[0]
             else:
-                samp_band = load_band.sample()[0]
+                samp_band = load_band.sample(
+                    rng=self._cam.tel.exp.sim.exp_rng)[0]
             # Enforce physical limits
             samp_band = self._phys_lims(samp_band)
         else:
@@ -190,7 +190,7 @@ class Parameter:
         return self.fetch(band_ind)[2]
 
     def sample(self, band_ind=None, nsample=1,
-               min=None, max=None, null=False):
+               min=None, max=None, null=False, rng=None):
         """
         Sample parameter distribution for band_id nsample times
         and return the sampled values in an array if nsample > 1
@@ -203,7 +203,11 @@ class Parameter:
         min (float): the minimum allowed value to be returned
         max (float): the maximum allowed value to be returned
         null (bool): whether to sample around zero
+        rng (np.random.Generator): random number stream to draw from.
+        Defaults to None, which uses the global numpy stream.
         """
+        if rng is None:
+            rng = np.random
         # If min and max not explicitly passed, use constructor values
         if min is None:
             min = self._min
@@ -211,13 +215,13 @@ class Parameter:
             max = self._max
         # If this parameter is a distribution, just sample it
         if isinstance(self._val, ds.Distribution):
-            samp = self._float(self._val.sample(nsample=nsample))
+            samp = self._val.sample(nsample=nsample, rng=rng)
+            if nsample == 1:
+                samp = self._float(samp)
+            else:
+                samp = self.unit.to_SI(np.array(samp).astype(float))
             # Check that the sampled value doesn't surpasse the max or min
-            if min is not None and samp < min:
-                return min
-            if max is not None and samp > max:
-                return max
-            return samp
+            return self._clip(samp, min, max)
         # Retrieve the mean, median, and std for this band
         vals = self.fetch(band_ind)
         avg = vals[0]
@@ -239,17 +243,27 @@ class Parameter:
             if str(std) == "NA" or np.any(std <= 0.):
                 return samp_avg
             elif nsample == 1:
-                samp = np.random.normal(samp_avg, std, nsample)[0]
+                samp = rng.normal(samp_avg, std, nsample)[0]
             else:
-                samp = np.random.normal(samp_avg, std, nsample)
+                samp = rng.normal(samp_avg, std, nsample)
             # Check that the sampled value doesn't surpasse the max or min
+            return self._clip(samp, min, max)
+
+    # ***** Helper Methods *****
+    def _clip(self, samp, min, max):
+        """ Limit sampled value(s) to the allowed range """
+        if np.ndim(samp) == 0:
             if min is not None and samp < min:
                 return min
             if max is not None and samp > max:
                 return max
             return samp
+        if min is not None:
+            samp = np.where(samp < min, min, samp)
+        if max is not None:
+            samp = np.where(samp > max, max, samp)
+        return samp
 
-    # ***** Helper Methods *****
     def _store_param(self, inp):
         """ Store input parameter """
         # Bools only passed from simulationInputs.txt
@@ -1,11 +1,19 @@
 # Built-in modules
 import numpy as np
+import collections as cl
 
 
 class Physics:
     """
     Physics object calculates physical quantities
 
+    Args:
+    occ_interp (array): temperatures [K] at which to tabulate photon
+    occupation numbers. Occupation numbers for temperatures within this
+    range are then interpolated from the table. Defaults to None, which
+    evaluates every temperature exactly, as does a table of fewer than
+    two distinct temperatures.
+
     Attributes:
     h (float): Planck constant [J/s]
     kB (float): Boltzmann constant [J/K]
@@ -17,7 +25,7 @@ class Physics:
     Tcmb (float): CMB Temperature [K]
     co (dict): CO Emission lines [Hz]
     """
-    def __init__(self):
+    def __init__(self, occ_interp=None):
         self.h = 6.6261e-34
         self.kB = 1.3806e-23
         self.c = 299792458.0
@@ -27,6 +35,17 @@ class Physics:
         self.Z0 = np.sqrt(self.mu0/self.ep0)
         self.Tcmb = 2.725
 
+        # Occupation numbers memoized per (freq grid, temperature)
+        self._occ_memo = cl.OrderedDict()
+        self._occ_memo_max = 1024
+        # Optional interpolation tables, one per freq grid
+        self._occ_temps = None
+        if occ_interp is not None:
+            occ_temps = np.unique(np.asarray(occ_interp, dtype=float))
+            if len(occ_temps) >= 2:
+                self._occ_temps = occ_temps
+        self._occ_tables = {}
+
     # ***** Public Methods *****
     def lamb(self, freq, ind=1.0):
         """
@@ -232,7 +251,7 @@ class Physics:
         """
         freq, temp, emis = self._check_inputs(freq, [temp, emis])
         return (emis * (2 * self.h * (freq**3) /
-                (self.c**2)) * self.n_occ(freq, temp))
+                (self.c**2)) * self._occ(freq, temp))
 
     def bb_pow_spec(self, freq, temp, emis=1.0):
         """
@@ -262,10 +281,67 @@ class Physics:
         """
         freq, temp, emiss = self._check_inputs(freq, [temp, emiss])
         return (((self.h**2) / self.kB) * emiss *
-                (self.n_occ(freq, temp)**2) * ((freq**2)/(temp**2)) *
+                (self._occ(freq, temp)**2) * ((freq**2)/(temp**2)) *
                 np.exp((self.h * freq)/(self.kB * temp)))
 
     # ***** Helper Methods *****
+    def _occ(self, freq, temp):
+        """
+        Photon occupation numbers, looked up for temperatures that are
+        constant across the frequency axis
+        """
+        if (np.ndim(freq) != 1 or np.ndim(temp) == 0 or
+           np.shape(temp)[-1] != len(freq)):
+            return self.n_occ(freq, temp)
+        rows = np.reshape(temp, (-1, len(freq)))
+        const = np.all(rows == rows[:, :1], axis=1)
+        occ = np.empty(rows.shape)
+        if not np.all(const):
+            occ[~const] = self.n_occ(freq, rows[~const])
+        if np.any(const):
+            temps, inds = np.unique(rows[const, 0], return_inverse=True)
+            occ[const] = self._occ_lookup(freq, temps)[inds]
+        return occ.reshape(np.shape(temp))
+
+    def _occ_lookup(self, freq, temps):
+        """ Occupation numbers vs frequency for each passed temperature """
+        grid = (len(freq), freq[0], freq[-1])
+        occ = np.empty((len(temps), len(freq)))
+        exact = np.ones(len(temps), dtype=bool)
+        # Interpolate tabulated temperatures if a table is defined
+        if self._occ_temps is not None:
+            exact = ((temps < self._occ_temps[0]) |
+                     (temps > self._occ_temps[-1]))
+            if not np.all(exact):
+                occ[~exact] = self._occ_interp(freq, grid, temps[~exact])
+        # Otherwise, use the memoized occupation numbers
+        keys = [(grid, temp) for temp in temps]
+        new = [i for i in np.flatnonzero(exact)
+               if keys[i] not in self._occ_memo]
+        if len(new):
+            new_occ = self.n_occ(freq, temps[new][:, np.newaxis])
+            for i, row in zip(new, new_occ):
+                self._occ_memo[keys[i]] = row
+        for i in np.flatnonzero(exact):
+            self._occ_memo.move_to_end(keys[i])
+            occ[i] = self._occ_memo[keys[i]]
+        while len(self._occ_memo) > self._occ_memo_max:
+            self._occ_memo.popitem(last=False)
+        return occ
+
+    def _occ_interp(self, freq, grid, temps):
+        """ Occupation numbers interpolated from the temperature table """
+        if grid not in self._occ_tables:
+            self._occ_tables[grid] = self.n_occ(
+                freq, self._occ_temps[:, np.newaxis])
+        table = self._occ_tables[grid]
+        inds = np.clip(np.searchsorted(self._occ_temps, temps),
+                       1, len(self._occ_temps) - 1)
+        lo = self._occ_temps[inds - 1]
+        hi = self._occ_temps[inds]
+        wts = ((temps - lo) / (hi - lo))[:, np.newaxis]
+        return (1. - wts) * table[inds - 1] + wts * table[inds]
+
     def _check_inputs(self, x, inputs=None):
         ret = []
         if isinstance(x, np.ndarray) or isinstance(x, list):
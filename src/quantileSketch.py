@@ -0,0 +1,166 @@
+# Built-in modules
+import numpy as np
+
+
+class QuantileSketch:
+    """
+    QuantileSketch accumulates samples into logarithmically spaced bins,
+    such that percentiles can be estimated to a fixed relative accuracy
+    without storing the samples. Bins are added as samples arrive, so
+    outliers and heavy tails do not coarsen the bins that hold the bulk
+    of the samples. Sketches of the same accuracy merge exactly.
+
+    Args:
+    rel_acc (float): relative accuracy of each estimated ranked sample.
+    Defaults to 2.5e-4.
+    max_bins (int): maximum number of bins for each sign, beyond which
+    the bins nearest zero are collapsed. Defaults to 32768.
+
+    Attributes:
+    count (float): number of samples accumulated
+    """
+    def __init__(self, rel_acc=2.5e-4, max_bins=32768):
+        self._gamma = (1. + rel_acc) / (1. - rel_acc)
+        self._log_gamma = np.log(self._gamma)
+        self._max_bins = max_bins
+        # Dense bins of |sample|, with the key of the first bin, per sign
+        self._offs = {1: None, -1: None}
+        self._bins = {1: np.zeros(0), -1: np.zeros(0)}
+        self._zero = 0.
+        self._min = np.inf
+        self._max = -np.inf
+        # Samples which cannot be binned
+        self._ninf = 0.
+        self._pinf = 0.
+        self._nan = False
+        self.count = 0.
+
+    # ***** Public Methods *****
+    def add(self, vals, weights=None):
+        """
+        Accumulate samples
+
+        Args:
+        vals (array): samples to accumulate
+        weights (array): weight of each sample. Defaults to None,
+        which weights every sample by one.
+        """
+        vals = np.ravel(np.asarray(vals, dtype=float))
+        if weights is None:
+            weights = np.ones(len(vals))
+        else:
+            weights = np.ravel(np.asarray(weights, dtype=float))
+        self.count += np.sum(weights)
+        # Set aside NaN and infinite samples
+        finite = np.isfinite(vals)
+        if not np.all(finite):
+            self._nan = self._nan or bool(np.any(np.isnan(vals)))
+            self._ninf += np.sum(weights[vals == -np.inf])
+            self._pinf += np.sum(weights[vals == np.inf])
+            vals = vals[finite]
+            weights = weights[finite]
+        if len(vals) == 0:
+            return
+        self._min = min(self._min, np.amin(vals))
+        self._max = max(self._max, np.amax(vals))
+        self._zero += np.sum(weights[vals == 0.])
+        for sign in [1, -1]:
+            mask = sign * vals > 0.
+            if np.any(mask):
+                self._add_keys(sign, self._keys(np.abs(vals[mask])),
+                               weights[mask])
+        return
+
+    def merge(self, other):
+        """
+        Accumulate the samples of another sketch
+
+        Args:
+        other (src.QuantileSketch): sketch to merge into this one
+        """
+        self._nan = self._nan or other._nan
+        self._ninf += other._ninf
+        self._pinf += other._pinf
+        self._zero += other._zero
+        self.count += other.count
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        for sign in [1, -1]:
+            bins = other._bins[sign]
+            filled = bins > 0.
+            if not np.any(filled):
+                continue
+            keys = other._offs[sign] + np.arange(len(bins))
+            # Bins of other accuracies are re-binned from their values
+            if other._gamma != self._gamma:
+                keys = self._keys(other._value(keys))
+            self._add_keys(sign, keys[filled], bins[filled])
+        return
+
+    def percentile(self, q):
+        """
+        Estimate percentiles of the accumulated samples, interpolating
+        between ranks as np.percentile does
+
+        Args:
+        q (float or array): percentiles, between 0 and 100
+        """
+        q = np.asarray(q, dtype=float)
+        if self._nan or self.count == 0:
+            return np.full(np.shape(q), np.nan)
+        # Interpolate between the neighboring ranked samples
+        rank = np.clip(q / 100. * (self.count - 1), 0., None)
+        lo = self._ranked(np.floor(rank))
+        hi = self._ranked(np.ceil(rank))
+        frac = rank - np.floor(rank)
+        # Infinite neighbors interpolate to NaN, as in np.percentile
+        with np.errstate(invalid="ignore"):
+            return np.where(frac > 0., lo + frac * (hi - lo), lo)
+
+    # ***** Helper Methods *****
+    def _keys(self, vals):
+        """ Bin keys of positive values """
+        return np.ceil(np.log(vals) / self._log_gamma).astype(np.int64)
+
+    def _value(self, keys):
+        """ Value of each bin, within the relative accuracy of its samples """
+        return 2. * np.exp(keys * self._log_gamma) / (self._gamma + 1.)
+
+    def _add_keys(self, sign, keys, weights):
+        """ Add weights to the bins of one sign, growing them if needed """
+        off, bins = self._offs[sign], self._bins[sign]
+        if off is None:
+            off = int(np.amin(keys))
+        lo = min(off, int(np.amin(keys)))
+        hi = max(off + len(bins) - 1, int(np.amax(keys)))
+        # Collapse the bins nearest zero when the range grows too wide
+        if hi - lo + 1 > self._max_bins:
+            lo = hi - self._max_bins + 1
+            keys = np.maximum(keys, lo)
+        if lo != off or hi != off + len(bins) - 1:
+            grown = np.zeros(hi - lo + 1)
+            old_keys = np.maximum(off + np.arange(len(bins)), lo)
+            np.add.at(grown, old_keys - lo, bins)
+            off, bins = lo, grown
+        bins += np.bincount(keys - off, weights=weights, minlength=len(bins))
+        self._offs[sign], self._bins[sign] = off, bins
+        return
+
+    def _ranked(self, rank):
+        """ Estimate ranked samples from the bin values """
+        neg_keys = (self._offs[-1] or 0) + np.arange(len(self._bins[-1]))
+        pos_keys = (self._offs[1] or 0) + np.arange(len(self._bins[1]))
+        # Bin values and counts in ascending order
+        vals = np.concatenate([
+            [-np.inf], -self._value(neg_keys)[::-1], [0.],
+            self._value(pos_keys), [np.inf]])
+        counts = np.concatenate([
+            [self._ninf], self._bins[-1][::-1], [self._zero],
+            self._bins[1], [self._pinf]])
+        inds = np.clip(np.searchsorted(
+            np.cumsum(counts), rank, side="right"), 0, len(counts) - 1)
+        ret = vals[inds]
+        # Ranked samples lie between the smallest and largest samples
+        finite = np.isfinite(ret)
+        ret[finite] = np.clip(ret[finite], self._min, self._max)
+        return ret
@@ -0,0 +1,111 @@
+# Built-in modules
+import numpy as np
+
+# BoloCalc modules
+import src.quantileSketch as qs
+
+
+class ResultStore:
+    """
+    ResultStore holds the outputs of every experiment realization in one
+    contiguous float64 array per telescope, camera, channel, and output
+    quantity. Arrays grow in chunks as realizations are appended.
+
+    Args:
+    stream (bool): accumulate each output into a src.QuantileSketch
+    rather than an array. Defaults to False.
+    chunk (int): minimum number of samples by which an array grows.
+    Defaults to 1024.
+    """
+    def __init__(self, stream=False, chunk=1024):
+        # Store passed parameters
+        self._stream = stream
+        self._chunk = chunk
+        # Output buffers and the number of samples filled in each
+        self._bufs = {}
+        self._lens = {}
+
+    # ***** Public Methods *****
+    def append(self, key, vals):
+        """
+        Append samples to an output
+
+        Args:
+        key (tuple): output key, such as (name, tel, cam, ch, quantity)
+        vals (array): samples to append
+        """
+        if self._stream:
+            if key not in self._bufs:
+                self._bufs[key] = qs.QuantileSketch()
+            self._bufs[key].add(vals)
+            return
+        vals = np.ravel(np.asarray(vals, dtype=np.float64))
+        if key not in self._bufs:
+            self._bufs[key] = np.empty(max(self._chunk, len(vals)))
+            self._lens[key] = 0
+        # Grow the buffer geometrically when full
+        start = self._lens[key]
+        stop = start + len(vals)
+        if stop > len(self._bufs[key]):
+            buf = np.empty(max(2 * len(self._bufs[key]), stop))
+            buf[:start] = self._bufs[key][:start]
+            self._bufs[key] = buf
+        self._bufs[key][start:stop] = vals
+        self._lens[key] = stop
+        return
+
+    def extend(self, name, outputs):
+        """
+        Append nested outputs of one realization, such as those returned
+        by src.Sensitivity, keying each array of samples by its indices
+
+        Args:
+        name (str): first element of every key
+        outputs (list): nested lists, whose innermost arrays are samples
+        """
+        self._extend((name,), outputs)
+        return
+
+    def merge(self, other):
+        """
+        Accumulate the outputs of another store, such as one filled by a
+        worker process
+
+        Args:
+        other (src.ResultStore): store to merge into this one
+        """
+        for key in other.keys():
+            if self._stream and key in self._bufs:
+                self._bufs[key].merge(other.get(key))
+            elif self._stream:
+                self._bufs[key] = other.get(key)
+            else:
+                self.append(key, other.get(key))
+        return
+
+    def get(self, key):
+        """
+        Return the samples of an output as an array view, or its
+        src.QuantileSketch when streaming. The view is invalidated by
+        later appends to the same output.
+
+        Args:
+        key (tuple): output key
+        """
+        if self._stream:
+            return self._bufs[key]
+        return self._bufs[key][:self._lens[key]]
+
+    def keys(self):
+        """ Return the stored output keys """
+        return list(self._bufs.keys())
+
+    # ***** Helper Methods *****
+    def _extend(self, key, node):
+        """ Append the innermost arrays of a nested output """
+        if len(node) and not isinstance(node[0], (list, np.ndarray)):
+            self.append(key, node)
+        else:
+            for n, child in enumerate(node):
+                self._extend(key + (n,), child)
+        return
@@ -0,0 +1,144 @@
+# Built-in modules
+import numpy as np
+
+# BoloCalc modules
+import src.parameter as pr
+
+
+class SamplingPlan:
+    """
+    SamplingPlan draws the sampled parameters in the experiment tree for
+    every experiment realization at once. Objects then read their values
+    by realization index.
+
+    Args:
+    sim (src.Simulation): parent Simulation object
+    seed_seq (np.random.SeedSequence): seed sequence for the draws
+    exp (src.Experiment): experiment whose parameters to plan. Defaults
+    to None, which plans the Simulation's experiment.
+    redraw (bool): rather than drawing the samples up front, redraw each
+    sample from a stream of its own realization and parameter, so that
+    changed parameters keep their random variates. Defaults to False.
+
+    Attributes:
+    redraw (bool): where 'redraw' arg is stored
+
+    Parents:
+    sim (src.Simulation): Simulation object
+    """
+    def __init__(self, sim, seed_seq, exp=None, redraw=False):
+        # Store passed parameters
+        self.sim = sim
+        self._seed_seq = seed_seq
+        self._rng = np.random.default_rng(seed_seq)
+        self._exp = self.sim.exp if exp is None else exp
+        self.redraw = redraw
+        self._log = self.sim.log
+        self._nexp = self.sim.param("nexp")
+        self._ndet = self.sim.param("ndet")
+
+        # Current experiment realization
+        self._n = 0
+        # Planned samples, or the stream index of each planned parameter
+        # when redrawing, keyed on (Parameter ID, band index)
+        self._params = []
+        self._samps = {}
+        self._inds = {}
+
+        if self.redraw:
+            self._log.log("Seeding parameter samples for all realizations")
+        else:
+            self._log.log("Drawing parameter samples for all realizations")
+        self._gather()
+
+    # ***** Public Methods *****
+    def set_realization(self, n):
+        """
+        Set the experiment realization from which to read samples
+
+        Args:
+        n (int): experiment realization index
+        """
+        self._n = n
+        return
+
+    def seed(self, key):
+        """
+        Seed sequence for an object of the current realization, such as a
+        channel, which draws the samples that are not planned
+
+        Args:
+        key (tuple): indices of the object in the experiment
+        """
+        return np.random.SeedSequence(
+            self._seed_seq.entropy,
+            spawn_key=self._seed_seq.spawn_key + (self._n, 1) + tuple(key))
+
+    def sample(self, param, band_ind=None, nsample=1, rng=None):
+        """
+        Return the planned sample(s) for a parameter, or sample it
+        directly if it is not planned
+
+        Args:
+        param (src.Parameter): parameter to sample
+        band_ind (int): band index for multi-band parameters
+        nsample (int): number of samples. Default is 1.
+        rng (np.random.Generator): stream for unplanned samples
+        """
+        key = (id(param), band_ind)
+        if key in self._inds:
+            seed = np.random.SeedSequence(
+                self._seed_seq.entropy,
+                spawn_key=self._seed_seq.spawn_key + (
+                    self._n, 0, self._inds[key]))
+            return param.sample(band_ind=band_ind, nsample=nsample,
+                                rng=np.random.default_rng(seed))
+        if key in self._samps:
+            samps = self._samps[key][self._n]
+            if len(samps) == nsample:
+                return samps[0] if nsample == 1 else samps
+        return param.sample(band_ind=band_ind, nsample=nsample, rng=rng)
+
+    # ***** Helper Methods *****
+    def _gather(self):
+        """ Draw samples for every sampled parameter in the experiment """
+        for tel in self._exp.tels.values():
+            # Experiment-level parameters are sampled when nexp > 1
+            if self._nexp > 1:
+                for param in tel.sampled_params():
+                    self._add(param, None, 1)
+            for cam in tel.cams.values():
+                if self._nexp > 1:
+                    for param in cam.sampled_params():
+                        self._add(param, None, 1)
+                for ch in cam.chs.values():
+                    if self._nexp > 1:
+                        for param in ch.sampled_params():
+                            self._add(param, None, 1)
+                        for opt in cam.opt_chn.optics.values():
+                            for param in opt.sampled_params():
+                                self._add(param, ch.band_ind, 1)
+                    # Detector parameters are sampled when ndet > 1
+                    if self._ndet > 1:
+                        for param in ch.det_dict.values():
+                            self._add(param, None, self._ndet)
+        return
+
+    def _add(self, param, band_ind, nper):
+        """ Draw nper samples per realization for a parameter """
+        if not isinstance(param, pr.Parameter):
+            return
+        if self.redraw:
+            self._params.append(param)
+            self._inds[(id(param), band_ind)] = len(self._inds)
+            return
+        nsample = self._nexp * nper
+        samps = param.sample(
+            band_ind=band_ind, nsample=nsample, rng=self._rng)
+        # Constant parameters are not planned
+        if np.ndim(samps) == 0 or np.size(samps) != nsample:
+            return
+        self._params.append(param)
+        self._samps[(id(param), band_ind)] = np.reshape(
+            samps, (self._nexp, nper))
+        return
@@ -1,3 +1,7 @@
+# Built-in modules
+import numpy as np
+
+
 class ScanStrategy:
     """
     ScanStrategy object is used to sample the elevation distribution
@@ -18,9 +22,21 @@ class ScanStrategy:
         self.max_elev = 90.
 
     # ***** Public Methods *****
-    def elev_sample(self):
-        """ Sample telescope elevation """
-        samp = self._tel.elev_sample()
+    def elev_sample(self, nsample=1):
+        """
+        Sample telescope elevation
+
+        Args:
+        nsample (int): number of samples to draw. Default is 1.
+        """
+        samp = self._tel.elev_sample(nsample)
+        if nsample > 1:
+            return np.array([self._elev_lims(s) for s in samp])
+        return self._elev_lims(samp)
+
+    # ***** Helper Methods *****
+    def _elev_lims(self, samp):
+        """ Limit an elevation sample to the allowed range """
         # Minimum allowed elevation = 20 deg
         if samp < self.min_elev:
             self._log.log(
@@ -1,7 +1,7 @@
 # Built-in modules
 import numpy as np
-import functools as ft
-import copy as cp
+import collections as cl
+import weakref as wr
 
 
 class Sensitivity:
@@ -16,6 +16,7 @@ class Sensitivity:
     exp_dir (str): input experiment directory
     senses (list): array of output sensitivities
     opt_pos (list): array of output optical power arrays
+    nparam (int): number of output sensitivity parameters per channel
 
     Parents:
     sim (src.Simulation): parent Simulation object
@@ -31,17 +32,91 @@ class Sensitivity:
         self._nobs = sim.param("nobs")
         self._ndet = sim.param("ndet")
 
+        # Sensitivity stages in evaluation order, each with the stages
+        # whose outputs it reads and the attributes it stores
+        self._stage_deps = cl.OrderedDict([
+            ("pow_spec", []),
+            ("popt", ["pow_spec"]),
+            ("rj_temp", ["pow_spec"]),
+            ("photon_NEP", ["pow_spec"]),
+            ("bolo_NEP", ["popt"]),
+            ("read_NEP", ["popt", "photon_NEP", "bolo_NEP"]),
+            ("tot_NEP", ["photon_NEP", "bolo_NEP", "read_NEP"]),
+            ("NET", ["tot_NEP"]),
+            ("NET_RJ", ["NET"]),
+            ("NET_arr", ["NET"]),
+            ("NET_arr_RJ", ["NET_RJ"]),
+            ("corr_deg", ["NET"]),
+            ("map_depth", ["NET_arr"]),
+            ("map_depth_RJ", ["NET_arr_RJ"])])
+        self._stage_outs = {
+            "pow_spec": ["_cum_eff", "_pow_spec", "_bw"],
+            "popt": ["_popt_arr"],
+            "rj_temp": ["_tel_eff_arr", "_tel_rj_temp", "_sky_rj_temp"],
+            "photon_NEP": ["_NEP_ph_arr", "_NEP_ph_arr_corr"],
+            "bolo_NEP": ["_NEP_bolo_arr"],
+            "read_NEP": ["_NEP_read_arr"],
+            "tot_NEP": ["_NEP", "_NEP_corr"],
+            "NET": ["_NET", "_NET_corr"],
+            "NET_RJ": ["_NET_RJ", "_NET_corr_RJ"],
+            "NET_arr": ["_NET_arr"],
+            "NET_arr_RJ": ["_NET_arr_RJ"],
+            "corr_deg": ["_corr_deg"],
+            "map_depth": ["_map_depth"],
+            "map_depth_RJ": ["_map_depth_RJ"]}
+        # Parameters which only feed stages downstream of the optical
+        # power, keyed to the stages that read them directly
+        self._param_stages = {
+            "psat": ["bolo_NEP", "read_NEP"],
+            "psat_fact": ["bolo_NEP", "read_NEP"],
+            "n": ["bolo_NEP"],
+            "g": ["bolo_NEP"],
+            "flink": ["bolo_NEP"],
+            "nei": ["read_NEP"],
+            "bolo_r": ["read_NEP"],
+            "read_frac": ["read_NEP"],
+            "sfact": ["read_NEP"],
+            "det_per_waf": ["NET_arr", "NET_arr_RJ"],
+            "waf_per_ot": ["NET_arr", "NET_arr_RJ"],
+            "ot": ["NET_arr", "NET_arr_RJ"],
+            "yield": ["NET_arr", "NET_arr_RJ"],
+            "opt_coup": ["NET"],
+            "net_mgn": ["NET_arr", "NET_arr_RJ"],
+            "fsky": ["map_depth", "map_depth_RJ"],
+            "tobs": ["map_depth", "map_depth_RJ"],
+            "obs_eff": ["map_depth", "map_depth_RJ"]}
+        # Output parameter distributions, in output order
+        self._sens_attrs = [
+            "_tel_eff_arr", "_popt_arr", "_tel_rj_temp", "_sky_rj_temp",
+            "_NEP_ph_arr", "_NEP_bolo_arr", "_NEP_read_arr", "_NEP",
+            "_NET", "_NET_RJ", "_NET_arr", "_NET_arr_RJ", "_corr_deg",
+            "_map_depth", "_map_depth_RJ"]
+        self.nparam = len(self._sens_attrs)
+        # Large spectra which are not kept between evaluations
+        self._unkept = ["_cum_eff", "_pow_spec"]
+        # Stage outputs from each channel's last evaluation
+        self._stage_vals = wr.WeakKeyDictionary()
+
     # ***** Public methods *****
-    def sensitivity(self, exp=None):
+    def sensitivity(self, exp=None, out=None):
         """
         Calculate sensitivity for a given experiment
 
         Args:
         exp (src.Experiment): Experiment to evaluate. Defaults to None,
         which triggers evaluating the parent Experiment object
+        out (np.array): array shaped (ntel, ncam, nch, nparam, nsamples)
+        to write the sensitivities into. Defaults to None, which returns
+        nested lists.
         """
         if exp is None:
             exp = self.exp
+        if out is not None:
+            for i, tp in enumerate(exp.tels.values()):
+                for j, cam in enumerate(tp.cams.values()):
+                    for k, ch in enumerate(cam.chs.values()):
+                        self.ch_sensitivity(ch, out=out[i, j, k])
+            return out
         return [[[self.ch_sensitivity(ch) for ch in cam.chs.values()]
                 for cam in tp.cams.values()]
                 for tp in exp.tels.values()]
@@ -52,215 +127,199 @@ class Sensitivity:
                 for cm in tp.cams.values()]
                 for tp in self.exp.tels.values()]
 
-    def ch_sensitivity(self, ch):
+    def ch_sensitivity(self, ch, changed=None, out=None):
         """
         Calculate channel sensitivity of a specific Channel object
 
+        All quantities are calculated at once for every observation
+        and detector realization, using arrays shaped (nobs, ndet)
+
         Args:
         ch (src.Channel): Channel object
+        changed (list): keys of the parameters changed since the channel's
+        last sensitivity calculation. Only the stages downstream of them
+        are recalculated. Defaults to None, which recalculates every stage.
+        out (np.array): array shaped (nparam, nsamples) to write the
+        sensitivity into. Defaults to None, which returns lists.
         """
-        # Calculate optical power
-        self._calc_popt(ch)
-        self._calc_rj_temp(ch)
-        # Calculate NEP
-        self._calc_photon_NEP(ch)
-        self._calc_bolo_NEP(ch)
-        self._calc_read_NEP(ch)
-        self._calc_tot_NEP(ch)
-        # Calculte NET
-        self._calc_NET(ch)
-        self._calc_NET_RJ(ch)
-        # Calculate array NET
-        self._calc_NET_arr(ch)
-        self._calc_NET_arr_RJ(ch)
-        # Calculate correlation degradation
-        self._calc_corr_deg(ch)
-        # Calculate map depth
-        self._calc_map_depth(ch)
-        self._calc_map_depth_RJ(ch)
-
-        # Return a list of parameter distributions
-        return [self._tel_eff_arr.flatten().tolist(),
-                self._popt_arr.flatten().tolist(),
-                self._tel_rj_temp.flatten().tolist(),
-                self._sky_rj_temp.flatten().tolist(),
-                self._NEP_ph_arr.flatten().tolist(),
-                self._NEP_bolo_arr.flatten().tolist(),
-                self._NEP_read_arr.flatten().tolist(),
-                self._NEP.flatten().tolist(),
-                self._NET.flatten().tolist(),
-                self._NET_RJ.flatten().tolist(),
-                self._NET_arr.flatten().tolist(),
-                self._NET_arr_RJ.flatten().tolist(),
-                self._corr_deg.flatten().tolist(),
-                self._map_depth.flatten().tolist(),
-                self._map_depth_RJ.flatten().tolist()]
+        stages = list(self._stage_deps.keys())
+        if (changed is not None and self.updatable(changed) and
+           ch in self._stage_vals):
+            # Restore the channel's unchanged stage outputs
+            for attr, val in self._stage_vals[ch].items():
+                setattr(self, attr, val)
+            dirty = self._dirty_stages(changed)
+            stages = [stage for stage in stages if stage in dirty]
+        # Calculate from the power spectra on the detector,
+        # through the optical power and NEP, to the NET and map depth
+        for stage in stages:
+            getattr(self, "_calc_" + stage)(ch)
+        # Keep the stage outputs for later incremental updates
+        self._stage_vals[ch] = {
+            attr: getattr(self, attr)
+            for outs in self._stage_outs.values() for attr in outs
+            if attr not in self._unkept}
+
+        # Write or return a list of parameter distributions
+        if out is not None:
+            for m, attr in enumerate(self._sens_attrs):
+                out[m] = np.ravel(getattr(self, attr))
+            return out
+        return [getattr(self, attr).flatten().tolist()
+                for attr in self._sens_attrs]
+
+    def updatable(self, changed):
+        """
+        Whether a sensitivity can be updated after changing parameters
+        without re-evaluating the channel's optical power
+
+        Args:
+        changed (list): keys of the changed parameters
+        """
+        return np.all([key in self._param_stages for key in changed])
 
     # *** Helper methods ***
+    def _dirty_stages(self, changed):
+        """ Stages downstream of the changed parameters """
+        dirty = set()
+        for key in changed:
+            dirty.update(self._param_stages[key])
+        # Stages are in evaluation order, so one pass propagates changes
+        for stage, deps in self._stage_deps.items():
+            if np.any([dep in dirty for dep in deps]):
+                dirty.add(stage)
+        return dirty
+
     def _opt_pow(self, ch):
         """ Calculate optical power table for a specific channel """
-        # Store passed parameters
-        self._pow_sky_side = []
-        self._pow_det_side = []
-        self._eff_elem = []
-        self._eff_det_side = []
-        for i in range(len(ch.elem)):  # nobs
-            pow_sky_side_1 = []
-            pow_det_side_1 = []
-            eff_elem_1 = []
-            eff_det_side_1 = []
-            for j in range(len(ch.elem[i])):  # ndet
-                window = np.array(ch.det_arr.dets[j].window)
-                bw = ch.det_arr.dets[j].param("bw")
-                pows = []
-                pow_sky_side_2 = []
-                pow_det_side_2 = []
-                eff_sky_side_2 = []
-                eff_elem_2 = []
-                eff_det_side_2 = []
-                # Store efficiency towards sky and towards detector
-                for k in range(len(ch.elem[i][j])):  # nelem
-                    # Store efficiency
-                    eff_elem_2.append(ch.tran[i][j][k])
-                    # Buffer the efficiency array
-                    eff_arr = np.vstack([ch.tran[i][j],
-                                         np.array([1. for f in ch.freqs])])
-                    # Efficiency towards the detector
-                    cum_eff_det = ft.reduce(lambda x, y: x*y, eff_arr[k+1:])
-                    eff_det_side_2.append(np.array(cum_eff_det))
-                    # Efficiency towards the sky
-                    if k == 0:
-                        # Zero elements sky side
-                        cum_eff_sky = [[0. for f in ch.freqs]]
-                    elif k == 1:
-                        # One element sky side
-                        cum_eff_sky = [[1. for f in ch.freqs],
-                                       [0. for f in ch.freqs]]
-                    else:
-                        cum_eff_sky = [ft.reduce(
-                            lambda x, y: x*y, eff_arr[m+1:k])
-                            if m < k-2 else eff_arr[m+1]
-                            for m in range(k-1)] + [[1. for f in ch.freqs],
-                                                    [0. for f in ch.freqs]]
-                    eff_sky_side_2.append(cum_eff_sky)
-                    pow = self._phys.bb_pow_spec(
-                        ch.freqs, ch.temp[i][j][k], ch.emis[i][j][k])
-                    pows.append(pow)
-                # Store band-averaged power from sky and power on detector
-                # and band-average the efficiencies
-                for k in range(len(ch.elem[i][j])):
-                    pow_out = np.trapz(pows[k] * eff_det_side_2[k], ch.freqs)
-                    pow_det_side_2.append(pow_out)
-                    if k == len(ch.elem[i][j]) - 1:
-                        eff_elem_2[k] = np.trapz(eff_elem_2[k], ch.freqs) / bw
-                    else:
-                        eff_elem_2[k] = (
-                            np.trapz(
-                                eff_elem_2[k] * eff_elem_2[-1], ch.freqs) / 
-                            np.trapz(eff_elem_2[-1], ch.freqs))
-                    eff_det_side_2[k] = (
-                        np.trapz(eff_det_side_2[k], ch.freqs) / bw)
-                    pow_in = sum([np.trapz(
-                        pows[m] * eff_sky_side_2[k][m] *
-                        window, ch.freqs)
-                        for m in range(k)])
-                    pow_sky_side_2.append(pow_in)
-                # Force the final efficiency to be 100%
-                eff_det_side_2[-1] = 1.
-                pow_sky_side_1.append(pow_sky_side_2)
-                pow_det_side_1.append(pow_det_side_2)
-                eff_elem_1.append(eff_elem_2)
-                eff_det_side_1.append(eff_det_side_2)
-            self._pow_sky_side.append(pow_sky_side_1)
-            self._pow_det_side.append(pow_det_side_1)
-            self._eff_elem.append(eff_elem_1)
-            self._eff_det_side.append(eff_det_side_1)
+        nelem = np.shape(ch.tran)[-2]
+        # Detector windows shaped (ndet, 1, nfreq), bandwidths (ndet, 1)
+        window = np.array(
+            [det.window for det in ch.det_arr.dets])[:, np.newaxis, :]
+        bw = self._det_vals(ch, "bw")[:, np.newaxis]
+        # Power spectrum emitted by each element
+        pows = self._phys.bb_pow_spec(ch.freqs, ch.temp, ch.emis)
+        # Power on the detector and efficiency towards the detector
+        cum_eff = self._cum_eff_det_side(ch.tran)
+        self._pow_det_side = np.trapz(pows * cum_eff, ch.freqs)
+        self._eff_det_side = np.trapz(cum_eff, ch.freqs) / bw
+        # Force the final efficiency to be 100%
+        self._eff_det_side[..., -1] = 1.
+        # Power incident on each element from the sky side, accumulated
+        # by transmitting the power from the previous element
+        pow_sky_side = np.zeros(np.shape(pows))
+        for k in range(1, nelem):
+            pow_sky_side[..., k, :] = (
+                pow_sky_side[..., k-1, :] * ch.tran[..., k-1, :] +
+                pows[..., k-1, :])
+        self._pow_sky_side = np.trapz(pow_sky_side * window, ch.freqs)
+        # Element efficiencies, band-averaged using the detector band
+        det_tran = ch.tran[..., -1:, :]
+        self._eff_elem = (
+            np.trapz(ch.tran * det_tran, ch.freqs) /
+            np.trapz(det_tran, ch.freqs))
+        self._eff_elem[..., -1] = (
+            np.trapz(det_tran[..., 0, :], ch.freqs) / bw[..., 0])
         # Build table of optical powers and efficiencies for each element
         return self._opt_table()
 
+    def _calc_pow_spec(self, ch):
+        """ Calculate element power spectra for a specific channel """
+        # Efficiency between each element and the detector
+        self._cum_eff = self._cum_eff_det_side(ch.tran)
+        # Power spectrum on the detector from each element,
+        # shaped (nobs, ndet, nelem, nfreq)
+        self._pow_spec = self._phys.bb_pow_spec(
+            ch.freqs, ch.temp, ch.emis * self._cum_eff)
+        # Detector bandwidths, shaped (ndet,)
+        self._bw = self._det_vals(ch, "bw")
+        return
+
     def _calc_popt(self, ch):
         """ Calculate optical power for a specific channel """
-        self._popt_arr = np.array([[self._popt(
-            ch.elem[i][j], ch.emis[i][j], ch.tran[i][j],
-            ch.temp[i][j], ch.freqs)
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
+        self._popt_arr = np.trapz(
+            np.sum(self._pow_spec, axis=-2), ch.freqs)
         return
 
     def _calc_rj_temp(self, ch):
         """ Calculate telescope RJ temp for a specific temperature """
         n_sky_elem = self._num_sky_elem(ch)
         # Telescope efficiency
-        self._tel_eff_arr = np.array([[self._eff(
-            ch.tran[i][j][n_sky_elem-1:],
-            ch.freqs, ch.det_arr.dets[j].param("bw"))
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
+        self._tel_eff_arr = np.trapz(
+            self._cum_eff[..., n_sky_elem-1, :] *
+            ch.tran[..., n_sky_elem-1, :], ch.freqs) / self._bw
         # Telescope temperature
-        self._tel_rj_temp = np.array([[self._rj_temp(
-            ch.elem[i][j][n_sky_elem:],
-            ch.emis[i][j][n_sky_elem:],
-            ch.tran[i][j][n_sky_elem:],
-            ch.temp[i][j][n_sky_elem:],
-            ch.freqs, self._tel_eff_arr[i][j],
-            ch.det_arr.dets[j].param("bw"))
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
+        tel_pow = np.trapz(np.sum(
+            self._pow_spec[..., n_sky_elem:, :], axis=-2), ch.freqs)
+        self._tel_rj_temp = self._phys.rj_temp(
+            tel_pow, self._bw, self._tel_eff_arr)
         # Sky temperature
-        self._sky_rj_temp = np.array([[self._rj_temp(
-            ch.elem[i][j][:n_sky_elem],
-            ch.emis[i][j][:n_sky_elem],
-            ch.tran[i][j],
-            ch.temp[i][j][:n_sky_elem],
-            ch.freqs, self._tel_eff_arr[i][j],
-            ch.det_arr.dets[j].param("bw"))
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
+        sky_pow = np.trapz(np.sum(
+            self._pow_spec[..., :n_sky_elem, :], axis=-2), ch.freqs)
+        self._sky_rj_temp = self._phys.rj_temp(
+            sky_pow, self._bw, self._tel_eff_arr)
         return
 
     def _calc_photon_NEP(self, ch):
         """ Calculate photon NEP for a specific channel """
         if self._corr:
-            pass_ch = ch
+            # Element names are the same for every realization
+            det_pitch = (
+                ch.param("pix_sz") /
+                float(ch.cam.param("fnum") * self._phys.lamb(
+                    ch.param("bc"))))
+            self._NEP_ph_arr, self._NEP_ph_arr_corr = self._noise.photon_NEP(
+                self._pow_spec, ch.freqs, ch.elem, det_pitch,
+                roles=ch.elem_role)
         else:
-            pass_ch = None
-        NEP_ph_out = np.array([[self._photon_NEP(
-            ch.elem[i][j], ch.emis[i][j], ch.tran[i][j],
-            ch.temp[i][j], ch.freqs, pass_ch)
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
-        # pylint: disable=unbalanced-tuple-unpacking
-        NEP_ph_arr, NEP_ph_arr_corr = np.split(NEP_ph_out, 2, axis=2)
-        self._NEP_ph_arr = np.reshape(
-            NEP_ph_arr, np.shape(NEP_ph_arr)[:2])
-        self._NEP_ph_arr_corr = np.reshape(
-            NEP_ph_arr_corr, np.shape(NEP_ph_arr_corr)[:2])
+            # Both outputs are identical
+            self._NEP_ph_arr, self._NEP_ph_arr_corr = self._noise.photon_NEP(
+                self._pow_spec, ch.freqs)
         return
 
     def _calc_bolo_NEP(self, ch):
         """ Calculate bolometer NEP for a specific channel """
-        self._NEP_bolo_arr = np.array([[self._bolo_NEP(
-            self._popt_arr[i][j], ch.det_arr.dets[j])
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
+        n = self._det_vals(ch, "n")
+        tb = self._det_vals(ch, "tb")
+        tc = self._det_vals(ch, "tc")
+        g = self._det_vals(ch, "g")
+        if isinstance(g, str):
+            psat = self._det_vals(ch, "psat")
+            if isinstance(psat, str):
+                psat = self._det_vals(ch, "psat_fact") * self._popt_arr
+            g = self._noise.G(psat, n, tb, tc)
+        flink = self._det_vals(ch, "flink")
+        if isinstance(flink, str):
+            flink = self._noise.Flink(n, tb, tc)
+        self._NEP_bolo_arr = self._obs_det_arr(
+            self._noise.bolo_NEP(flink, g, tc))
         return
 
     def _calc_read_NEP(self, ch):
         """ Calculate readout NEP for a specific channel """
-        NEP_read_arr = np.array([[self._read_NEP(
-            self._popt_arr[i][j], ch.det_arr.dets[j])
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
-
-        if np.any(np.isin(NEP_read_arr.astype(str), ['NA'])):
-            self._NEP_read_arr = np.array([[np.sqrt(
-                (1. + ch.det_arr.dets[j].param("read_frac"))**2 - 1.) *
-                np.sqrt(self._NEP_ph_arr[i][j]**2 +
-                        self._NEP_bolo_arr[i][j]**2)
-                for j in range(self._ndet)]
-                for i in range(self._nobs)])
+        nei = self._det_vals(ch, "nei")
+        bolo_r = self._det_vals(ch, "bolo_r")
+        # Use the readout noise fraction if the readout is not defined
+        if isinstance(nei, str) or isinstance(bolo_r, str):
+            read_frac = self._det_vals(ch, "read_frac")
+            self._NEP_read_arr = (
+                np.sqrt((1. + read_frac)**2 - 1.) *
+                np.sqrt(self._NEP_ph_arr**2 + self._NEP_bolo_arr**2))
+            return
+        # Bias power
+        psat = self._det_vals(ch, "psat")
+        if isinstance(psat, str):
+            sat = np.zeros(np.shape(self._popt_arr), dtype=bool)
+            p_bias = (self._det_vals(ch, "psat_fact") - 1.) * self._popt_arr
         else:
-            self._NEP_read_arr = NEP_read_arr
+            # Saturated detectors have no readout noise
+            sat = (self._popt_arr >= psat)
+            p_bias = np.where(sat, 1., psat - self._popt_arr)
+        sfact = self._det_vals(ch, "sfact")
+        if isinstance(sfact, str):
+            sfact = 1.
+        self._NEP_read_arr = np.where(
+            sat, 0., self._noise.read_NEP(p_bias, bolo_r, nei, sfact))
         return
 
     def _calc_tot_NEP(self, ch):
@@ -276,163 +335,76 @@ class Sensitivity:
 
     def _calc_NET(self, ch):
         """ Calculate NET for a specific channel """
+        sky_eff = np.prod(ch.tran, axis=-2)
         # Total NET
-        self._NET = np.array([[self._noise.NET_from_NEP(
-            self._NEP[i][j], ch.freqs, np.prod(ch.tran[i][j], axis=0),
-            ch.cam.param("opt_coup"))
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
+        self._NET = self._noise.NET_from_NEP(
+            self._NEP, ch.freqs, sky_eff, ch.cam.param("opt_coup"))
         # Total NET with correlation adjustment
-        self._NET_corr = np.array([[self._noise.NET_from_NEP(
-            self._NEP_corr[i][j], ch.freqs, np.prod(ch.tran[i][j], axis=0),
-            ch.cam.param("opt_coup"))
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
+        self._NET_corr = self._noise.NET_from_NEP(
+            self._NEP_corr, ch.freqs, sky_eff, ch.cam.param("opt_coup"))
         return
 
     def _calc_NET_RJ(self, ch):
         """ Calculate RJ NET for a specific channel """
-        self._NET_RJ = np.array([[self._Trj_over_Tcmb(
-            ch.freqs)*self._NET[i][j]
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
-        self._NET_corr_RJ = np.array([[self._Trj_over_Tcmb(
-            ch.freqs)*self._NET_corr[i][j]
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
+        factor = self._Trj_over_Tcmb(ch.freqs)
+        self._NET_RJ = factor * self._NET
+        self._NET_corr_RJ = factor * self._NET_corr
         return
 
     def _calc_NET_arr(self, ch):
         """ Calcualte array NET for a specific channel """
-        self._NET_arr = np.array([[self._noise.NET_arr(
-            self._NET_corr[i][j], ch.param("ndet"), ch.param("yield"))
-            for j in range(self._ndet)]
-            for i in range(self._nobs)]) * (
+        self._NET_arr = self._noise.NET_arr(
+            self._NET_corr, ch.param("ndet"), ch.param("yield")) * (
                 ch.cam.tel.param("net_mgn"))
         return
 
     def _calc_NET_arr_RJ(self, ch):
         """ Calculate array NET RJ for a specific channel """
-        self._NET_arr_RJ = np.array([[self._noise.NET_arr(
-            self._NET_corr_RJ[i][j], ch.param("ndet"), ch.param("yield"))
-            for j in range(self._ndet)]
-            for i in range(self._nobs)]) * (
+        self._NET_arr_RJ = self._noise.NET_arr(
+            self._NET_corr_RJ, ch.param("ndet"), ch.param("yield")) * (
                 ch.cam.tel.param("net_mgn"))
         return
 
     def _calc_corr_deg(self, ch):
         """ Calculate correlation factor for a specific channel """
-        self._corr_deg = np.array([[self._NET_corr[i][j] / self._NET[i][j]
-                                  for j in range(self._ndet)]
-                                  for i in range(self._nobs)])
+        self._corr_deg = self._NET_corr / self._NET
         return
 
     def _calc_map_depth(self, ch):
         """ Calculate map depth for a specific channel """
         tel = ch.cam.tel
-        self._map_depth = np.array([[self._noise.map_depth(
-            self._NET_arr[i][j], tel.param("fsky"),
+        self._map_depth = self._noise.map_depth(
+            self._NET_arr, tel.param("fsky"),
             tel.param("tobs"), tel.param("obs_eff"))
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
         return
 
     def _calc_map_depth_RJ(self, ch):
         """ Calculate RJ map depth for a specific channel """
         tel = ch.cam.tel
-        self._map_depth_RJ = np.array([[self._noise.map_depth(
-            self._NET_arr_RJ[i][j], tel.param("fsky"),
+        self._map_depth_RJ = self._noise.map_depth(
+            self._NET_arr_RJ, tel.param("fsky"),
             tel.param("tobs"), tel.param("obs_eff"))
-            for j in range(self._ndet)]
-            for i in range(self._nobs)])
         return
 
-    def _eff(self, tran, freqs, bw):
-        """ Calculate cumulative efficiency """
-        tot_eff = np.trapz(np.prod(tran, axis=0), freqs) / bw
-        return tot_eff
-
-    def _popt(self, elem, emis, tran, temp, freqs):
-        """ Calculate optical power """
-        buf_tran = self._buffer_tran(tran, freqs)
-        tot_pow = np.sum([np.trapz(
-            self._phys.bb_pow_spec(
-                freqs, temp[i], emis[i] *
-                np.prod(buf_tran[i+1:], axis=0)), freqs)
-                for i in range(len(elem))])
-        return tot_pow
-
-    def _rj_temp(self, elem, emis, tran, temp, freqs, eff, bw):
-        """ Calculate RJ temperature """
-        opt_pow = self._popt(elem, emis, tran, temp, freqs)
-        rj_temp = self._phys.rj_temp(opt_pow, bw, eff)
-        return rj_temp
-
-    def _photon_NEP(self, elem, emis, tran, temp, freqs, ch=None):
-        """ Calculate photon NEP """
-        tran = self._buffer_tran(tran, freqs)
-        if ch:
-            corrs = True
-        else:
-            corrs = False
-        pow_ints = np.array([self._phys.bb_pow_spec(
-            freqs, temp[i], emis[i]*np.prod(tran[i+1:], axis=0))
-            for i in range(len(elem))])
-        if corrs:
-            # Photon NEP both without and with correlations
-            NEP_ph, NEP_ph_arr = self._noise.photon_NEP(
-                pow_ints, freqs, elem, (
-                    ch.param("pix_sz") /
-                    float(ch.cam.param("fnum") * self._phys.lamb(
-                        ch.param("bc")))))
-        else:
-            # Both outputs are identical
-            NEP_ph, NEP_ph_arr = self._noise.photon_NEP(pow_ints, freqs)
-        return NEP_ph, NEP_ph_arr
-
-    def _bolo_NEP(self, opt_pow, det):
-        """ Calculate bolometer NEP """
-        if 'NA' in str(det.param("g")):
-            if 'NA' in str(det.param("psat")):
-                g = self._noise.G(
-                    det.param("psat_fact") * opt_pow, det.param("n"),
-                    det.param("tb"), det.param("tc"))
-            else:
-                g = self._noise.G(
-                    det.param("psat"), det.param("n"),
-                    det.param("tb"), det.param("tc"))
-        else:
-            g = det.param("g")
-        if 'NA' in str(det.param("flink")):
-            return self._noise.bolo_NEP(
-                self._noise.Flink(
-                    det.param("n"), det.param("tb"), det.param("tc")),
-                g, det.param("tc"))
-        else:
-            return self._noise.bolo_NEP(
-                det.param("flink"), g, det.param("tc"))
-
-    def _read_NEP(self, opt_pow, det):
-        """ Calculate readout NEP """
-        if 'NA' in str(det.param("nei")):
+    def _cum_eff_det_side(self, tran):
+        """ Cumulative efficiency between each element and the detector """
+        # Cumulative product taken from the detector side
+        cum_tran = np.cumprod(tran[..., ::-1, :], axis=-2)[..., ::-1, :]
+        # Shift by one element, such that the last element sees 100%
+        eff = np.ones(np.shape(tran))
+        eff[..., :-1, :] = cum_tran[..., 1:, :]
+        return eff
+
+    def _det_vals(self, ch, param):
+        """ Return detector parameter values as an array over detectors """
+        vals = [det.param(param) for det in ch.det_arr.dets]
+        if np.any(['NA' in str(val) for val in vals]):
             return 'NA'
-        elif 'NA' in str(det.param("bolo_r")):
-            return 'NA'
-        elif 'NA' in str(det.param("psat")):
-            p_bias = (det.param("psat_fact") - 1.) * opt_pow
-        else:
-            if opt_pow >= det.param("psat"):
-                return 0.
-            else:
-                p_bias = det.param("psat") - opt_pow
+        return np.array(vals).astype(np.float)
 
-        if 'NA' in str(det.param("sfact")):
-            sfact = 1.
-        else:
-            sfact = det.param("sfact")
-        return self._noise.read_NEP(
-            p_bias, det.param("bolo_r"),
-            det.param("nei"), sfact)
+    def _obs_det_arr(self, arr):
+        """ Broadcast an array to shape (nobs, ndet) """
+        return np.ones((self._nobs, self._ndet)) * arr
 
     def _Trj_over_Tcmb(self, freqs):
         """ Convert to RJ temperature from CMB temperature """
@@ -441,12 +413,6 @@ class Sensitivity:
         factor = np.trapz(factor_spec, freqs)/bw
         return factor
 
-    def _buffer_tran(self, tran, freqs):
-        """ Function to buffer the transmission array with ones """
-        out_tran = cp.copy(np.insert(
-            tran, len(tran), [1. for f in freqs], axis=0))
-        return np.array(out_tran).astype(np.float)
-
     def _opt_table(self):
         """ Calculate optial power table """
         shape = np.shape(self._pow_sky_side)
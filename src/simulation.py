@@ -1,5 +1,6 @@
 # Built-in modules
 import datetime as dt
+import multiprocessing as mp
 import numpy as np
 import sys as sy
 import glob as gb
@@ -16,9 +17,47 @@ import src.unit as un
 import src.physics as ph
 import src.noise as ns
 # import src.profile as pf
+import src.samplingPlan as spl
+import src.resultStore as rs
 import src.sensitivity as sn
+import src.sky as sk
 import src.vary as vr
 
+# Simulation object inherited by forked worker processes
+_worker_sim = None
+
+
+def _init_worker():
+    """ Collect log messages in a worker process for the parent to write """
+    _worker_sim.log.buffer()
+
+
+def _evaluate_worker(args):
+    """ Evaluate one experiment realization in a worker process """
+    n, seed_seq = args
+    try:
+        sense, opt_pow = _worker_sim._evaluate_seeded(n, seed_seq)
+    except Exception as err:
+        # Hand the messages, such as the error itself, to the parent
+        err.log_msgs = _worker_sim.log.drain()
+        raise
+    return (sense, opt_pow, _worker_sim.log.drain())
+
+
+def _stream_worker(units):
+    """ Sketch a block of experiment realizations in a worker process """
+    results = rs.ResultStore(stream=True)
+    try:
+        for n, seed_seq in units:
+            sense, opt_pow = _worker_sim._evaluate_seeded(n, seed_seq)
+            results.extend("sens", sense)
+            results.extend("opt", opt_pow)
+    except Exception as err:
+        # Hand the messages, such as the error itself, to the parent
+        err.log_msgs = _worker_sim.log.drain()
+        raise
+    return (results, _worker_sim.log.drain())
+
 
 class Simulation:
     """
@@ -29,11 +68,31 @@ class Simulation:
     log_file (str): logging file
     sim_file (str): simulation input file
     exp_dir (str): experiment directory
+    jobs (int): number of processes over which to spread experiment
+    realizations. Defaults to 1.
+    seed (int): seed for the experiment realizations. Defaults to None,
+    which draws a fresh seed.
+    stream (bool): accumulate the outputs into quantile sketches rather
+    than storing every sample. Defaults to False.
+    hdf5 (bool): also write the outputs to sensitivity.hdf5 in the
+    experiment directory. Defaults to False.
+    occ_interp (list): minimum temperature [K], maximum temperature [K],
+    and number of log-spaced temperatures at which to tabulate photon
+    occupation numbers, which are then interpolated for temperatures
+    within the table. Defaults to None, which evaluates every temperature
+    exactly.
 
     Attributes:
     exp_dir (str): input experiment directory
-    senses (list): array of output sensitivities
-    opt_pos (list): array of output optical power arrays
+    exp_rng (np.random.Generator): stream for experiment, telescope,
+    camera, channel, and optic parameters
+    obs_rng (np.random.Generator): stream for observation parameters
+    det_rng (np.random.Generator): stream for detector parameters
+    stream (bool): where 'stream' arg is stored
+    hdf5 (bool): where 'hdf5' arg is stored
+    results (src.ResultStore): output sensitivities and optical powers of
+    every realization, keyed by ("sens", tel, cam, ch, quantity) and
+    ("opt", tel, cam, ch, column, element)
 
     Children:
     log (src.Log): Log object
@@ -44,14 +103,27 @@ class Simulation:
     sns (src.Sensitivity): Sensitivity object
     dsp (src.Display): Display object
     """
-    def __init__(self, log_file, sim_file, exp_dir):
+    def __init__(self, log_file, sim_file, exp_dir, jobs=1, seed=None,
+                 stream=False, hdf5=False, occ_interp=None):
         # Store experiment input file
         self.exp_dir = exp_dir
         self._sim_file = sim_file
+        self._jobs = jobs
+        self.stream = stream
+        self.hdf5 = hdf5
 
         # Set up logging
         self.log = lg.Log(log_file)
 
+        # Root of the random number streams
+        self._seed_seq = np.random.SeedSequence(seed)
+        self.log.log(
+            "Seeding random number streams with entropy %d"
+            % (self._seed_seq.entropy))
+        self.seed_rngs(self.spawn_seed())
+        # Parameter samples drawn for all realizations at once
+        self._plan = None
+
         # Latest atm file
         self._atm_log = 'atm_log.txt'
         self._check_atm()
@@ -63,7 +135,7 @@ class Simulation:
         # Build simulation-wide objects
         self.log.log("Generating Simulation object")
         self.load = ld.Loader(self)
-        self.phys = ph.Physics()
+        self.phys = ph.Physics(self._occ_temps(occ_interp))
         self.noise = ns.Noise(self.phys)
         # Store parameter values
         self._store_param_dict()
@@ -79,8 +151,7 @@ class Simulation:
         self.dsp = dp.Display(self)
 
         # Output arrays
-        self.senses = []
-        self.opt_pows = []
+        self.results = rs.ResultStore(stream=self.stream)
 
     # **** Public Methods ****
     # @pf.profiler
@@ -90,7 +161,7 @@ class Simulation:
         self._display()
         return
 
-    def vary_simulate(self, param_file, vary_name, vary_tog):
+    def vary_simulate(self, param_file, vary_name, vary_tog, out_fmt="txt"):
         """
         Run parameter vary simulation
 
@@ -98,11 +169,70 @@ class Simulation:
         param_file (str): file that contains the parameters to be varied
         vary_name (str): name of the vary output directory
         vary_tog (bool): whether or not to vary the parameter arrays together
+        out_fmt (str): vary output format: 'txt', 'hdf5', or 'both'.
+        Defaults to 'txt'.
         """
-        vary = vr.Vary(self, param_file, vary_name, vary_tog)
+        vary = vr.Vary(
+            self, param_file, vary_name, vary_tog, self._jobs, out_fmt)
         vary.vary()
         return
 
+    def spawn_seed(self):
+        """ Spawn an independent seed sequence from the simulation seed """
+        return self._seed_seq.spawn(1)[0]
+
+    def seed_rngs(self, seed_seq):
+        """
+        Store independent experiment, observation, and detector streams
+
+        Args:
+        seed_seq (np.random.SeedSequence): seed sequence for the streams
+        """
+        self.exp_rng, self.obs_rng, self.det_rng = [
+            np.random.default_rng(child) for child in seed_seq.spawn(3)]
+        return
+
+    def set_plan(self, plan):
+        """
+        Set the plan from which to read sampled parameters
+
+        Args:
+        plan (src.SamplingPlan): sampling plan, or None to sample directly
+        """
+        self._plan = plan
+        return
+
+    def reseed_rngs(self, key):
+        """
+        Re-seed the streams for one object of the current realization when
+        the sampling plan redraws its samples, such that the object draws
+        the same values however often it is re-evaluated
+
+        Args:
+        key (tuple): indices of the object in the experiment
+        """
+        if self._plan is not None and self._plan.redraw:
+            self.seed_rngs(self._plan.seed(key))
+        return
+
+    def sample(self, param, band_ind=None, nsample=1, rng=None):
+        """
+        Sample a parameter, reading the planned samples when evaluating
+        experiment realizations
+
+        Args:
+        param (src.Parameter): parameter to sample
+        band_ind (int): band index for multi-band parameters
+        nsample (int): number of samples. Default is 1.
+        rng (np.random.Generator): stream to sample from. Defaults to None,
+        which uses the experiment stream.
+        """
+        if rng is None:
+            rng = self.exp_rng
+        if self._plan is not None:
+            return self._plan.sample(param, band_ind, nsample, rng)
+        return param.sample(band_ind=band_ind, nsample=nsample, rng=rng)
+
     def param(self, param):
         """
         Return parameter from param_dict
@@ -344,6 +474,21 @@ class Simulation:
             "DepthRj": self.std_params["MAPDEPTH"].unit}
         return
 
+    def _occ_temps(self, occ_interp):
+        """ Temperatures at which to tabulate photon occupation numbers """
+        if occ_interp is None:
+            return None
+        tmin, tmax, num = occ_interp
+        if not (0. < tmin < tmax) or int(num) < 2:
+            self.log.err(
+                "Occupation interpolation table needs 0 < min < max "
+                "temperature and at least 2 temperatures, not %s"
+                % (str(occ_interp)))
+        self.log.log(
+            "Interpolating photon occupation numbers from %d temperatures "
+            "between %.3g K and %.3g K" % (int(num), tmin, tmax))
+        return np.geomspace(tmin, tmax, int(num))
+
     def _store_param_dict(self):
         """ Store input parameters in dictionary """
         # Check whether the simulation file exists
@@ -417,17 +562,104 @@ class Simulation:
                 "Total sims = %d"
                 % (self.param("nexp"), self.param("ndet"),
                    self.param("nobs"), tot_sims)))
-        for n in range(self.param("nexp")):
-            self._evaluate_exp(n)
+        seeds = self._realization_seeds()
+        self._plan = spl.SamplingPlan(self, self.spawn_seed())
+        jobs = min(self._jobs, self.param("nexp"))
+        if jobs > 1 and "fork" not in mp.get_all_start_methods():
+            self.log.wrn(
+                "Process pool requires the 'fork' start method, which is "
+                "not available on this platform. Running serially.")
+            jobs = 1
+        if jobs > 1:
+            self._evaluate_pool(seeds, jobs)
+        else:
+            for n in range(self.param("nexp")):
+                self._evaluate_exp(n, seeds[n])
+        self._plan = None
         self._done()
+        self._log_atm_cache()
         return
 
-    def _evaluate_exp(self, n):
+    def _realization_seeds(self):
+        """ Independent seed sequences for each experiment realization """
+        return self._seed_seq.spawn(self.param("nexp"))
+
+    def _evaluate_exp(self, n, seed_seq):
         """ Evaluate and calculate sensitivity for a generated experiment """
         self._status(n)
+        sense, opt_pow = self._evaluate_seeded(n, seed_seq)
+        self._store_outputs(sense, opt_pow)
+        return
+
+    def _evaluate_seeded(self, n, seed_seq):
+        """ Evaluate experiment realization 'n' from its own streams """
+        self.seed_rngs(seed_seq)
+        self._plan.set_realization(n)
         self.exp.evaluate()
-        self.senses.append(self.sns.sensitivity())
-        self.opt_pows.append(self.sns.opt_pow())
+        sense, opt_pow = self.sns.sensitivity(), self.sns.opt_pow()
+        self.log.flush()
+        return (sense, opt_pow)
+
+    def _evaluate_pool(self, seeds, jobs):
+        """ Evaluate experiment realizations over a process pool """
+        global _worker_sim
+        self.log.log(
+            "Evaluating experiment realizations over %d processes" % (jobs))
+        # Each forked worker owns a copy of the Experiment object
+        _worker_sim = self
+        self.log.flush()
+        ctx = mp.get_context("fork")
+        units = list(enumerate(seeds[:-1]))
+        # The parent evaluates the last realization alongside jobs - 1
+        # workers, which hand their log messages back rather than sharing
+        # the log file handle
+        with ctx.Pool(jobs - 1, initializer=_init_worker) as pool:
+            try:
+                if self.stream:
+                    # Each worker sketches one block of realizations, and
+                    # the sketches merge exactly in any order
+                    blocks = [[units[i] for i in inds] for inds in (
+                        np.array_split(np.arange(len(units)), jobs - 1))
+                        if len(inds)]
+                    outs = pool.imap(_stream_worker, blocks)
+                else:
+                    outs = pool.imap(_evaluate_worker, units)
+                # The parent Experiment then holds the same state for the
+                # Display as in a serial run
+                last = self._evaluate_seeded(len(seeds) - 1, seeds[-1])
+                if self.stream:
+                    done = 0
+                    for block, (results, msgs) in zip(blocks, outs):
+                        self.log.replay(msgs)
+                        self._status(done)
+                        self.results.merge(results)
+                        done += len(block)
+                else:
+                    # Results arrive in realization order
+                    for n, (sense, opt_pow, msgs) in enumerate(outs):
+                        self.log.replay(msgs)
+                        self._status(n)
+                        self._store_outputs(sense, opt_pow)
+            except Exception as err:
+                self.log.replay(getattr(err, "log_msgs", []))
+                raise
+        _worker_sim = None
+        self._status(len(seeds) - 1)
+        self._store_outputs(*last)
+        return
+
+    def _store_outputs(self, sense, opt_pow):
+        """ Store the sensitivities and optical powers of a realization """
+        self.results.extend("sens", sense)
+        self.results.extend("opt", opt_pow)
+        return
+
+    def _log_atm_cache(self):
+        """ Log ATM spectrum cache statistics """
+        store = sk.atm_store(self.atm_file)
+        self.log.log(
+            "ATM spectrum cache: %d hits, %d misses"
+            % (store.hits, store.misses))
         return
 
     def _display(self):
@@ -9,12 +9,139 @@ except ImportError:
         "As of BoloCalc v0.10.0, h5py is used to load ATM profiles\n"
         "Use pip to install via 'pip install h5py'\n"
         "Or, if using an Anaconda environment, 'conda install h5py'\n")
+import collections as cl
 import os
 
 # BoloCalc modules
 import src.foregrounds as fg
 
 
+class AtmStore:
+    """
+    AtmStore keeps an ATM HDF5 file open and caches selected spectra
+
+    Args:
+    atm_file (str): path to the ATM HDF5 file
+    max_size (int): maximum number of cached spectra. Default is 4096.
+    """
+    def __init__(self, atm_file, max_size=4096):
+        # Store passed parameters
+        self.atm_file = atm_file
+        self.max_size = max_size
+
+        # Cache counters
+        self.hits = 0
+        self.misses = 0
+
+        self._hf = None
+        self._cache = cl.OrderedDict()
+
+    # ***** Public Methods ******
+    def select(self, site, pwv, elev):
+        """
+        Retrieve an ATM spectrum
+
+        Args:
+        site (str): site name as labeled in the HDF5 file
+        pwv (int): PWV [um]
+        elev (int): elevation [deg]
+        """
+        key = (site, pwv, elev)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        self.misses += 1
+        if self._hf is None:
+            self._hf = hp.File("%s" % (self.atm_file), "r")
+        data = self._hf[site]["%d,%d" % (pwv, elev)][()]
+        spec = (data[0], data[3], data[2])
+        for arr in spec:
+            arr.setflags(write=False)
+        self._cache[key] = spec
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return spec
+
+    def close(self):
+        """ Close the HDF5 file and clear the cache """
+        if self._hf is not None:
+            self._hf.close()
+            self._hf = None
+        self._cache.clear()
+
+
+class AtmGrid:
+    """
+    AtmGrid holds ATM temperatures and transmissions interpolated onto a
+    fixed frequency grid for each reachable PWV and elevation node
+
+    Args:
+    atm_file (str): ATM HDF5 file from which to select ATM spectra
+    site (str): site name as labeled in the HDF5 file
+    freqs (np.array): frequencies [Hz] at which to evaluate the ATM
+    pwvs (np.array): reachable PWV nodes [um]
+    elevs (np.array): reachable elevation nodes [deg]
+    """
+    def __init__(self, atm_file, site, freqs, pwvs, elevs):
+        # Store passed parameters
+        self._atm_file = atm_file
+        self._site = site
+        self._freqs = freqs
+        self._pwvs = pwvs
+        self._elevs = elevs
+
+        # Spectrum cubes are filled the first time each node is drawn
+        shape = (len(self._pwvs), len(self._elevs), len(self._freqs))
+        self._temp = np.zeros(shape)
+        self._tran = np.zeros(shape)
+        self._filled = np.zeros(shape[:-1], dtype=bool)
+
+    # ***** Public Methods ******
+    def spectrum(self, pwv, elev):
+        """
+        Return the (temp, tran) spectra for a PWV and elevation node,
+        or None if the node is not on the grid
+
+        Args:
+        pwv (int): PWV [um]
+        elev (int): elevation [deg]
+        """
+        i = np.searchsorted(self._pwvs, pwv)
+        j = np.searchsorted(self._elevs, elev)
+        if (i == len(self._pwvs) or j == len(self._elevs) or
+           self._pwvs[i] != pwv or self._elevs[j] != elev):
+            return None
+        if not self._filled[i, j]:
+            GHz_to_Hz = 1.e+09
+            # Look up the store of this process, which owns its own handle
+            freq, tran, temp = atm_store(self._atm_file).select(
+                self._site, pwv, elev)
+            freq = freq * GHz_to_Hz
+            self._temp[i, j] = np.interp(self._freqs, freq, temp)
+            self._tran[i, j] = np.interp(self._freqs, freq, tran)
+            self._filled[i, j] = True
+        return self._temp[i, j], self._tran[i, j]
+
+
+# ATM stores shared by all Sky objects in a process
+_atm_stores = {}
+
+
+def atm_store(atm_file):
+    """
+    Process-wide AtmStore for an ATM HDF5 file
+
+    Args:
+    atm_file (str): path to the ATM HDF5 file
+    """
+    # Keyed on the process ID so that forked workers open their own handle
+    key = (os.path.abspath(atm_file), os.getpid())
+    if key not in _atm_stores:
+        _atm_stores[key] = AtmStore(atm_file)
+    return _atm_stores[key]
+
+
 class Sky:
     """
     Sky object contains the foregrounds and atmosphere
@@ -47,6 +174,8 @@ class Sky:
         # Allowed site names
         self._allowed_sites = [
             "ATACAMA", "POLE", "MCMURDO", "SPACE", "CUST"]
+        # ATM grids for each channel frequency grid
+        self._atm_grids = {}
 
     # ***** Public Methods ******
     def evaluate(self, sky_temp, pwv, elev, freqs):
@@ -54,78 +183,95 @@ class Sky:
         Generate the sky elements, absorbtivities, transmissions,
         and temperatures
 
+        Returns the element names and the absorbtivity, transmission,
+        and temperature arrays, each shaped (nelem, nfreq)
+
         Args:
+        sky_temp (float): custom sky temperature or 'NA'
         pwv (float): PWV
         elev (float): elevation
         freqs (float): frequencies [Hz] at which to evlauate the sky
         """
+        freqs = np.asarray(freqs, dtype=float)
+        nfreq = len(freqs)
         site = self.tel.param("site").upper()
         # Custom sky effective brightness temperature
         if sky_temp != "NA":
-            Nsky = ['Sky' for f in freqs]
-            Tsky = [sky_temp for f in freqs]
-            Esky = [1. for f in freqs]
-            Asky = [1. for f in freqs]
-            return [[Nsky],
-                    [Asky],
-                    [Esky],
-                    [Tsky]]
+            return (["Sky"],
+                    np.broadcast_to(1., (1, nfreq)),
+                    np.broadcast_to(1., (1, nfreq)),
+                    np.full((1, nfreq), float(sky_temp)))
         elif site in self._allowed_sites:
             # Check that an atmosphere exists
             if site != 'SPACE':
-                Natm = ['ATM' for f in freqs]
-                Tatm, Eatm = self._atm_spectrum(pwv, elev, freqs)[1:]
-                Aatm = [1. for f in freqs]
+                Tatm, Eatm = self._atm_spectrum(pwv, elev, freqs)
             # Won't look at the atmosphere from space, probably
             else:  # site = 'SPACE'
                 pass  # no atmosphere
-        else:  
+        else:
             self._log.err(
                 "Could not understand site '%s' defined for telescope '%s'\n"
                 "Allowed options: %s, or a float." % (
                     site.lower().capitalize(), self.tel.name,
                     ', '.join(self._allowed_sites)))
 
-        Ncmb = ['CMB' for f in freqs]
-        Tcmb = [self._phys.Tcmb for f in freqs]
-        Ecmb = [1. for f in freqs]
-        Acmb = [1. for f in freqs]
+        elem = ["CMB"]
+        temp = [np.full(nfreq, self._phys.Tcmb)]
+        tran = [np.ones(nfreq)]
         # Include foregrounds
         if self._infg:
-            Nsyn = ['SYNC' for f in freqs]
-            Tsyn = self._syn_temp(freqs)
-            Esyn = [1. for f in freqs]
-            Asyn = [1. for f in freqs]
-            Ndst = ['DUST' for f in freqs]
-            Tdst = self._dst_temp(freqs)
-            Edst = [1. for f in freqs]
-            Adst = [1. for f in freqs]
-            if site != 'SPACE':
-                return [[Ncmb, Nsyn, Ndst, Natm],
-                        [Acmb, Asyn, Adst, Aatm],
-                        [Ecmb, Esyn, Edst, Eatm],
-                        [Tcmb, Tsyn, Tdst, Tatm]]
-            else:
-                return [[Ncmb, Nsyn, Ndst],
-                        [Acmb, Asyn, Adst],
-                        [Ecmb, Esyn, Edst],
-                        [Tcmb, Tsyn, Tdst]]
-        # Do not include foregrounds
-        else:
-            if site != 'SPACE':
-                return [[Ncmb, Natm],
-                        [Acmb, Aatm],
-                        [Ecmb, Eatm],
-                        [Tcmb, Tatm]]
-            else:
-                return [[Ncmb],
-                        [Acmb],
-                        [Ecmb],
-                        [Tcmb]]
-
-    def pwv_sample(self):
-        """ Sample the PWV distribution """
-        samp = self.tel.pwv_sample()
+            elem += ["SYNC", "DUST"]
+            temp += [self._syn_temp(freqs), self._dst_temp(freqs)]
+            tran += [np.ones(nfreq), np.ones(nfreq)]
+        # Include the atmosphere
+        if site != 'SPACE':
+            elem.append("ATM")
+            temp.append(Tatm)
+            tran.append(Eatm)
+        # Every sky element is fully absorbing
+        return (elem,
+                np.broadcast_to(1., (len(elem), nfreq)),
+                np.array(tran),
+                np.array(temp))
+
+    def pwv_sample(self, nsample=1):
+        """
+        Sample the PWV distribution
+
+        Args:
+        nsample (int): number of samples to draw. Default is 1.
+        """
+        samp = self.tel.pwv_sample(nsample)
+        if nsample > 1:
+            return np.array([self._pwv_lims(s) for s in samp])
+        return self._pwv_lims(samp)
+
+    def atm_grid(self, freqs):
+        """
+        ATM grid on a channel frequency grid, built once per grid
+
+        Args:
+        freqs (np.array): frequencies [Hz] at which to evaluate the ATM
+        """
+        site = self._hdf5_site()
+        key = (site, len(freqs), freqs[0], freqs[-1])
+        if key not in self._atm_grids:
+            mm_to_um = 1.e+03
+            scn = self.tel.scn
+            # The ATM file tabulates PWV from 0 to 8 mm in 0.1 mm steps
+            # and elevation in 1 deg steps
+            pwvs = np.arange(
+                int(round(self._min_pwv * mm_to_um)),
+                int(round(self._max_pwv * mm_to_um)) + 1, 100)
+            elevs = np.arange(
+                int(round(scn.min_elev, 0)), int(round(scn.max_elev, 0)) + 1)
+            self._atm_grids[key] = AtmGrid(
+                self._atm_file, site, np.array(freqs), pwvs, elevs)
+        return self._atm_grids[key]
+
+    # ***** Helper Methods *****
+    def _pwv_lims(self, samp):
+        """ Limit a PWV sample to the allowed range """
         # Minimum allowed PWV is 0 mm
         if samp < self._min_pwv:
             self._log.log('Cannot have PWV %.1f < %.1f. Using %.1f instead'
@@ -139,24 +285,21 @@ class Sky:
         else:
             return samp
 
-    # ***** Helper Methods *****
-    def _hdf5_select(self, pwv, elev):
-        """ Retrieve ATM spectrum from HDF5 file """
+    def _hdf5_site(self):
+        """ Site label in the HDF5 file """
         # Two-level dictionary structure in the HDF5 file
         site = self.tel.param("site").lower().capitalize()
         # McMurdo need camel casing
         if site == "Mcmurdo":
             site = "McMurdo"
-        key = "%d,%d" % (pwv, elev)
-        with hp.File("%s" % (self._atm_file), "r") as hf:
-            data = hf[site][key]
-            freq = data[0]
-            temp = data[2]
-            tran = data[3]
-        return (freq, tran, temp)
+        return site
+
+    def _hdf5_select(self, pwv, elev):
+        """ Retrieve ATM spectrum from HDF5 file """
+        return atm_store(self._atm_file).select(self._hdf5_site(), pwv, elev)
 
     def _atm_spectrum(self, pwv, elev, freqs):
-        """ Atmosphere spectrum given a PWV and elevation """
+        """ Atmosphere (temp, tran) spectra given a PWV and elevation """
         GHz_to_Hz = 1.e+09
         m_to_mm = 1.e+03
         mm_to_um = 1.e+03
@@ -165,14 +308,18 @@ class Sky:
             freq, tran, temp = self._load.atm(self.tel.param("atm_file"))
         # Otherwise, select the atmosphere from the HDF5 file
         else:
-            freq, tran, temp = self._hdf5_select(
-                int(round(pwv * m_to_mm, 1) * mm_to_um),
-                int(round(elev, 0)))
-        # Massage arrays
-        freq = (freq * GHz_to_Hz).flatten().tolist()
-        temp = np.interp(freqs, freq, temp).flatten().tolist()
-        tran = np.interp(freqs, freq, tran).flatten().tolist()
-        return freq, temp, tran
+            pwv_um = int(round(pwv * m_to_mm, 1) * mm_to_um)
+            elev_deg = int(round(elev, 0))
+            # Index the precomputed channel grid when the node is on it
+            spec = self.atm_grid(freqs).spectrum(pwv_um, elev_deg)
+            if spec is not None:
+                return spec
+            freq, tran, temp = self._hdf5_select(pwv_um, elev_deg)
+        # Interpolate onto the passed frequencies
+        freq = (np.asarray(freq) * GHz_to_Hz).flatten()
+        temp = np.interp(freqs, freq, np.ravel(temp))
+        tran = np.interp(freqs, freq, np.ravel(tran))
+        return temp, tran
 
     def _syn_temp(self, freqs):
         """ Synchrotron physical temperature spectrum """
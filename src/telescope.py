@@ -1,4 +1,5 @@
 # Built-in modules
+import numpy as np
 import glob as gb
 import os
 
@@ -37,6 +38,8 @@ class Telescope:
         self._log = self.exp.sim.log
         self._load = self.exp.sim.load
         self._std_params = self.exp.sim.std_params
+        # Parameters sampled per observation rather than per experiment
+        self._obs_params = ["elev", "pwv", "sky_temp"]
 
         self._log.log("Generating telescope realization from %s" % (self.dir))
         # Check whether telescope and config dir exists
@@ -112,26 +115,61 @@ class Telescope:
                     "Parameter '%s' not understood by Telescope.change_param()"
                     % (str(param)))
 
-    def sky_temp_sample(self):
-        """ Sample sky temperature for this telescope """
-        if self.exp.sim.param("nobs") == 1:
-            return self._param_dict["sky_temp"].get_med()
-        else:
-            return self._param_dict["sky_temp"].sample(nsample=1)
+    def sky_temp_sample(self, nsample=1):
+        """
+        Sample sky temperature for this telescope
 
-    def pwv_sample(self):
-        """ Sample PWV for this telescope """
-        if self.exp.sim.param("nobs") == 1:
-            return self._param_dict["pwv"].get_med()
-        else:
-            return self._param_dict["pwv"].sample(nsample=1)
+        Args:
+        nsample (int): number of samples to draw. Default is 1.
+        """
+        return self._obs_samp(self._param_dict["sky_temp"], nsample)
 
-    def elev_sample(self):
-        """ Sample elevation for this telescope """
-        if self.exp.sim.param("nobs") == 1:
-            return self._param_dict["elev"].get_med()
-        else:
-            return self._param_dict["elev"].sample(nsample=1)
+    def pwv_sample(self, nsample=1):
+        """
+        Sample PWV for this telescope
+
+        Args:
+        nsample (int): number of samples to draw. Default is 1.
+        """
+        return self._obs_samp(self._param_dict["pwv"], nsample)
+
+    def elev_sample(self, nsample=1):
+        """
+        Sample elevation for this telescope
+
+        Args:
+        nsample (int): number of samples to draw. Default is 1.
+        """
+        return self._obs_samp(self._param_dict["elev"], nsample)
+
+    def param_key(self, param):
+        """
+        Return the parameter dict key for a parameter name or key,
+        or None if the parameter is not a telescope parameter
+
+        Args:
+        param (str): name of parameter or param dict key
+        """
+        if param in self._param_dict.keys():
+            return param
+        return self._param_names.get(
+            param.replace(" ", "").strip().upper())
+
+    def resample_param(self, param):
+        """
+        Re-sample a single telescope parameter, leaving the other sampled
+        values unchanged
+
+        Args:
+        param (str): param dict key
+        """
+        self._param_vals[param] = self._param_val(param)
+        return
+
+    def sampled_params(self):
+        """ Parameter objects sampled for each experiment realization """
+        return [param for pid, param in self._param_dict.items()
+                if pid not in self._obs_params]
 
     # ***** Helper Methods *****
     def _check_dirs(self):
@@ -197,7 +235,7 @@ class Telescope:
         # Store telescope parameters
         self._param_vals = {}
         for k in self._param_dict:
-            self._param_vals[k] = self._param_samp(self._param_dict[k])
+            self._param_vals[k] = self._param_val(k)
         # Store telescope name
         self._param_vals["tel_name"] = (
             self.dir.rstrip(os.sep).split(os.sep)[-1])
@@ -227,12 +265,30 @@ class Telescope:
                               cm.Camera(self, cam_dirs[i])})
         return
 
+    def _obs_samp(self, param, nsample):
+        """ Sample observation parameter from the observation stream """
+        if self.exp.sim.param("nobs") == 1:
+            samp = param.get_med()
+        else:
+            samp = param.sample(nsample=nsample, rng=self.exp.sim.obs_rng)
+        # Return one value per sample
+        if nsample > 1 and np.ndim(samp) == 0:
+            samp = np.array([samp] * nsample)
+        return samp
+
+    def _param_val(self, param):
+        """ Value of a telescope parameter for this realization """
+        # Observation parameters are sampled by each observation
+        if param in self._obs_params:
+            return self._param_dict[param].get_med()
+        return self._param_samp(self._param_dict[param])
+
     def _param_samp(self, param):
         """ Sample telescope parameter """
         if self.exp.sim.param("nexp") == 1:
             return param.get_med()
         else:
-            return param.sample(nsample=1)
+            return self.exp.sim.sample(param)
 
     def _handle_atm(self):
         """ Handle the atmosphere for balloons and space """
@@ -1,4 +1,5 @@
 import numpy as np
+import h5py as hp
 import glob as gb
 import sys as sy
 import os
@@ -23,6 +24,7 @@ class Unpack:
         self._sens_file = 'sensitivity.txt'
         self._out_file = 'output.txt'
         self._pwr_file = 'optical_power.txt'
+        self._hdf5_file = 'sensitivity.hdf5'
         self._exp_dir = 'Experiments'
         self._total_params = [
             'Num Det', 'Array NET_CMB', 'Array NET_RJ',
@@ -110,6 +112,26 @@ class Unpack:
         self._gather_pwr_files()
         return
 
+    def unpack_hdf5(self, inp_dir):
+        """
+        Generate self.sens_outputs and self.pwr_outputs from the
+        sensitivity.hdf5 files in an input Experiment directory. The
+        spreads are read into lists, while the samples are memory-mapped
+        rather than loaded.
+
+        Args:
+        inp_dir (str): input directory. Must be an absolute path, not relative
+        """
+        self.sens_outputs = {}
+        self.pwr_outputs = {}
+        hdf5_files = [f for f in gb.iglob(
+            os.path.join(inp_dir, '**'+os.sep+'*'), recursive=True)
+            if os.path.basename(f) == self._hdf5_file]
+        for fname in hdf5_files:
+            key_exp = fname.split(self._exp_dir)[-1].split(os.sep)[1:][-2]
+            self._unpack_hdf5_file(fname, key_exp)
+        return
+
     def _gather_sens_files(self):
         # Look for sensitivity files in the defined directory and below
         sens_files = [f for f in gb.iglob(
@@ -423,6 +445,75 @@ class Unpack:
         out_dict[ch_key] = opt_dict
         return out_dict
 
+    # Unpack HDF5 files
+    def _unpack_hdf5_file(self, fname, key_exp):
+        with hp.File(fname, 'r') as f:
+            labs = list(f.attrs['params'].astype(str))
+            opt_labs = list(f.attrs['opt_params'].astype(str))
+            self.sens_outputs[key_exp] = {
+                self._sens_str: self._unpack_hdf5_summary(f)}
+            self.pwr_outputs[key_exp] = {}
+            for key_tel, tel in f['telescopes'].items():
+                self.sens_outputs[key_exp][key_tel] = {
+                    self._sens_str: self._unpack_hdf5_summary(tel)}
+                self.pwr_outputs[key_exp][key_tel] = {}
+                for key_cam, cam in tel['cameras'].items():
+                    sens_dict = {}
+                    out_dict = {}
+                    pwr_dict = {}
+                    pwr_all_dict = {}
+                    for key_ch, ch in cam['channels'].items():
+                        spreads = ch['spreads'][()]
+                        sens_dict[key_ch] = {
+                            self._num_det_str: [
+                                float(ch.attrs['ndet']), 0, 0]}
+                        sens_dict[key_ch].update({
+                            lab: spreads[i].tolist()
+                            for i, lab in enumerate(labs)})
+                        elems = list(ch.attrs['elements'].astype(str))
+                        opt_spreads = ch['opt_spreads'][()]
+                        pwr_dict[key_ch] = {
+                            elem: {lab: opt_spreads[i][j].tolist()
+                                   for i, lab in enumerate(opt_labs)}
+                            for j, elem in enumerate(elems)}
+                        # Samples are not stored for streamed runs
+                        if 'samples' in ch:
+                            samps = self._hdf5_view(fname, ch['samples'])
+                            out_dict[key_ch] = {
+                                lab: samps[i] for i, lab in enumerate(labs)}
+                        if 'opt_samples' in ch:
+                            samps = self._hdf5_view(
+                                fname, ch['opt_samples'])
+                            pwr_all_dict[key_ch] = {
+                                elem: {lab: samps[i][j]
+                                       for i, lab in enumerate(opt_labs)}
+                                for j, elem in enumerate(elems)}
+                    sens_dict.update(self._unpack_hdf5_summary(cam))
+                    self.sens_outputs[key_exp][key_tel][key_cam] = {
+                        self._sens_str: sens_dict, self._out_str: out_dict}
+                    self.pwr_outputs[key_exp][key_tel][key_cam] = {
+                        self._pwr_str: pwr_dict, self._out_str: pwr_all_dict}
+        return
+
+    def _unpack_hdf5_summary(self, grp):
+        # Summary rows of a camera, telescope, or experiment group
+        if 'summary' not in grp:
+            sy.exit("BoloCalc Unpack error: no summary found for '%s' "
+                    "in _unpack_hdf5_summary()" % (grp.name))
+        labs = grp.file.attrs['summary_params'].astype(str)
+        summary = grp['summary'][()]
+        return {row: {lab: summary[i][j].tolist()
+                      for j, lab in enumerate(labs)}
+                for i, row in enumerate(grp.attrs['rows'].astype(str))}
+
+    def _hdf5_view(self, fname, dset):
+        # Memory-map contiguous datasets, and read any others
+        offset = dset.id.get_offset()
+        if dset.chunks is None and offset is not None:
+            return np.memmap(fname, dtype=dset.dtype, mode='r',
+                             offset=offset, shape=dset.shape)
+        return dset[()]
+
     # Store data with spreads
     def _parse_spreads(self, inp_arr):
         ret_arr = []
@@ -1,13 +1,34 @@
 # Built-in modules
+import multiprocessing as mp
 import numpy as np
+import h5py as hp
 import sys as sy
-import copy as cp
 import os
 
 # BoloCalc modules
 import src.experiment as ex
+import src.samplingPlan as spl
 import src.unit as un
 
+# Vary object inherited by forked worker processes
+_worker_vary = None
+
+
+def _init_worker():
+    """ Collect log messages in a worker process for the parent to write """
+    _worker_vary._log.buffer()
+
+
+def _vary_worker(args):
+    """ Evaluate one chunk of parameter sets in a worker process """
+    try:
+        out = _worker_vary._vary_chunk(*args)
+    except Exception as err:
+        # Hand the messages, such as the error itself, to the parent
+        err.log_msgs = _worker_vary._log.drain()
+        raise
+    return (out, _worker_vary._log.drain())
+
 
 class Vary:
     """
@@ -20,11 +41,16 @@ class Vary:
     param_file (str): parameter vary input filename
     vary_name (str): name to which to save vary outputs
     vary_tog (bool): whether or not to vary input parameter arrays together
+    jobs (int): number of processes over which to spread parameter sets.
+    Defaults to 1.
+    out_fmt (str): format of the vary outputs: 'txt' for per-channel text
+    files, 'hdf5' for one HDF5 file, or 'both'. Defaults to 'txt'.
 
     Parents:
     sim (src.Simulation): parent Simulation object
     """
-    def __init__(self, sim, param_file, vary_name, vary_tog=False):
+    def __init__(self, sim, param_file, vary_name, vary_tog=False, jobs=1,
+                 out_fmt="txt"):
         # Store passed parameters
         self._sim = sim
         self._sns = self._sim.sns
@@ -36,6 +62,8 @@ class Vary:
         self._vary_tog = vary_tog
         self._units = self._sim.output_units
         self._nexp = self._sim.param("nexp")
+        self._jobs = jobs
+        self._out_fmt = out_fmt
 
         # Status bar length
         self._bar_len = 100
@@ -67,37 +95,68 @@ class Vary:
                 "Total sims = %d"
                 % (self._sim.param("nexp"), self._sim.param("ndet"),
                    self._sim.param("nobs"), tot_sims)))
-        self._exps = []
-        self._sens = []
-        for n in range(self._nexp):
-            self._status(n, self._nexp)
-            exp = ex.Experiment(self._sim)
-            exp.evaluate()
-            sns = self._sim.sns.sensitivity(exp)
-            self._exps.append(exp)
-            self._sens.append(sns)
-        self._done()
+        # Fiducial experiment, evaluated at the start of each work unit
+        self._exp = ex.Experiment(self._sim)
+        # Every parameter set of a realization draws from the same
+        # streams, keyed on the parameter or channel that draws
+        self._plan = spl.SamplingPlan(
+            self._sim, self._sim.spawn_seed(), exp=self._exp, redraw=True)
+        # Work units of (realization, first set, last set + 1). Each unit
+        # re-evaluates the experiment, so split the parameter sets of a
+        # realization only when there are more processes than realizations
+        nsets = len(self._set_arr)
+        nsplit = 1
+        if self._jobs > 1:
+            nsplit = min(int(np.ceil(self._jobs / self._nexp)), nsets)
+        chunk_len = int(np.ceil(nsets / nsplit))
+        units = [(n, i, min(i + chunk_len, nsets))
+                 for n in range(self._nexp)
+                 for i in range(0, nsets, chunk_len)]
+        # Sensitivities for every parameter set, shaped
+        # (nsets, ntel, ncam, nch, nparam, nsamples)
+        self._nsamp = self._sim.param("nobs") * self._sim.param("ndet")
+        tels = self._exp.tels.values()
+        self._sns_shape = (
+            len(tels), max([len(tel.cams) for tel in tels]),
+            max([len(cam.chs) for tel in tels for cam in tel.cams.values()]),
+            self._sns.nparam, self._nsamp)
+        self.adj_sns = np.full(
+            (nsets,) + self._sns_shape[:-1] + (self._nexp * self._nsamp,),
+            np.nan)
 
         # Loop over parameter set and adjust sensitivities
-        adj_sns = []
-        tot_adjs = self._nexp * len(self._set_arr)
+        tot_adjs = self._nexp * nsets
         self._log.out((
                 "Looping over %d parameter sets for %d realizations. "
                 "Number of experiment realizations to adjust = %d"
-                % (len(self._set_arr), self._sim.param("nexp"),
-                   tot_adjs)))
-        for n, (exp, sens) in enumerate(zip(self._exps, self._sens)):
-            adj_sns.append(self._vary_exp(exp, sens, n, tot_adjs))
+                % (nsets, self._sim.param("nexp"), tot_adjs)))
+        jobs = min(self._jobs, len(units))
+        if jobs > 1 and "fork" not in mp.get_all_start_methods():
+            self._log.wrn(
+                "Process pool requires the 'fork' start method, which is "
+                "not available on this platform. Running serially.")
+            jobs = 1
+        self._sim.set_plan(self._plan)
+        if jobs > 1:
+            self._vary_pool(units, jobs)
+        else:
+            for k, unit in enumerate(units):
+                self._status(k, len(units))
+                self._vary_chunk(*unit, out=self._unit_out(*unit))
+        self._sim.set_plan(None)
         self._done()
 
-        # Combine and save experiment realizations
-        self.adj_sns = np.concatenate(adj_sns, axis=-1)
+        # Save experiment realizations
         self._save()
         return
 
     # ***** Helper methods *****
     def _save(self):
         """ Save simulation outputs to files """
+        if self._out_fmt in ["hdf5", "both"]:
+            self._save_hdf5()
+        if self._out_fmt not in ["txt", "both"]:
+            return
         # Write parameter by parameter
         tot_writes = len(self.adj_sns)
         self._log.out((
@@ -108,12 +167,95 @@ class Vary:
         self._done()
         return
 
-    def _adjust_sens(self, exp, sns, tel='', cam='', ch='', opt=''):
+    def _save_hdf5(self):
+        """ Save inputs, spreads, and samples to one HDF5 file """
+        exp = self._exp
+        param_dir = self._check_dir(os.path.join(exp.dir, self._param_dir))
+        fout = os.path.join(param_dir, "%s.hdf5" % (self._vary_name))
+        nsets = len(self.adj_sns)
+        self._log.out((
+                "Writing outputs for %d parameter sets to %s" % (nsets, fout)))
+        units = list(self._units.values())
+        str_dt = hp.string_dtype()
+        with hp.File(fout, 'w') as f:
+            # Varied parameters and their values for each parameter set
+            inp = f.create_group("inputs")
+            for key, arr in [("telescope", self._tels),
+                             ("camera", self._cams),
+                             ("channel", self._chs),
+                             ("optic", self._opts),
+                             ("parameter", self._params),
+                             ("unit", self._unit_strs)]:
+                inp.create_dataset(key, data=list(arr), dtype=str_dt)
+            inp.create_dataset(
+                "values", data=np.array(self._set_arr, dtype=float))
+            # Names for the output axes
+            out = f.create_group("outputs")
+            out.create_dataset(
+                "tel_names", data=self._names(0), dtype=str_dt)
+            out.create_dataset(
+                "cam_names", data=self._names(1), dtype=str_dt)
+            out.create_dataset(
+                "ch_names", data=self._names(2), dtype=str_dt)
+            out.create_dataset(
+                "params", data=list(self._units.keys()), dtype=str_dt)
+            out.create_dataset(
+                "units", data=[unit.name for unit in units], dtype=str_dt)
+            # Spreads and Monte Carlo samples, one chunk per parameter set
+            shape = self.adj_sns.shape
+            samps = out.create_dataset(
+                "samples", shape=shape, dtype=float,
+                chunks=(1,) + shape[1:], compression="gzip", shuffle=True)
+            spreads = out.create_dataset(
+                "spreads", shape=shape[:-1] + (3,), dtype=float,
+                chunks=(1,) + shape[1:-1] + (3,), compression="gzip")
+            spreads.attrs["columns"] = ["median", "hi - median", "median - lo"]
+            pct_lo, pct_hi = self._sim.param("pct")
+            for i in range(nsets):
+                self._status(i, nsets)
+                # Convert from SI
+                sns = np.array([
+                    units[m].from_SI(self.adj_sns[i, ..., m, :])
+                    for m in range(len(units))])
+                sns = np.moveaxis(sns, 0, -2)
+                samps[i] = sns
+                lo, med, hi = np.percentile(
+                    sns, (float(pct_lo), 50.0, float(pct_hi)), axis=-1)
+                spreads[i] = np.stack(
+                    [med, np.abs(hi - med), np.abs(med - lo)], axis=-1)
+        self._done()
+        return
+
+    def _names(self, depth):
+        """
+        Telescope, camera, or channel names along the output axes, padded
+        with empty strings where cameras or channels are missing
+        """
+        shape = self.adj_sns.shape[1:depth + 2]
+        names = np.full(shape, "", dtype=object)
+        for i, tel in enumerate(self._exp.tels.values()):
+            if depth == 0:
+                names[i] = tel.param("tel_name")
+                continue
+            for j, cam in enumerate(tel.cams.values()):
+                if depth == 1:
+                    names[i, j] = cam.param("cam_name")
+                    continue
+                for k, ch in enumerate(cam.chs.values()):
+                    names[i, j, k] = ch.param("ch_name")
+        return names
+
+    def _adjust_sens(self, exp, sns, tel='', cam='', ch='', opt='',
+                     params=None):
         """ Calculate new sensitivity array where needed """
         tel = self._cap(tel)
         cam = self._cap(cam)
         ch = self._cap(ch)
         opt = self._cap(opt)
+        # Only recalculate downstream of the changed parameters if possible
+        if (params is not None and str(opt) == '' and
+           self._update_sens(exp, sns, tel, cam, ch, params)):
+            return
         # Change channel parameter
         if str(tel) != '' and str(cam) != '' and str(ch) != '':
             tel_ind = list(exp.tels.keys()).index(tel)
@@ -121,8 +263,8 @@ class Vary:
             ch_ind = list(exp.tels[tel].cams[cam].chs.keys()).index(ch)
             channel = exp.tels[tel].cams[cam].chs[ch]
             channel.evaluate()
-            sns[tel_ind][cam_ind][ch_ind] = self._sns.ch_sensitivity(
-                channel)
+            self._sns.ch_sensitivity(
+                channel, out=sns[tel_ind, cam_ind, ch_ind])
         # Change optics parameter for both channels
         elif (str(tel) != '' and str(cam) != '' and
               str(ch) == '' and str(opt) != ''):
@@ -133,8 +275,8 @@ class Vary:
                 ch_ind = list(exp.tels[tel].cams[cam].chs.keys()).index(ch)
                 channel = exp.tels[tel].cams[cam].chs[ch]
                 channel.evaluate()
-                sns[tel_ind][cam_ind][ch_ind] = self._sns.ch_sensitivity(
-                    channel)
+                self._sns.ch_sensitivity(
+                    channel, out=sns[tel_ind, cam_ind, ch_ind])
         # Change camera parameter
         elif str(tel) != '' and str(cam) != '':
             tel_ind = list(exp.tels.keys()).index(tel)
@@ -145,8 +287,8 @@ class Vary:
             for ch_ind, channel in enumerate(
                exp.tels[tel].cams[cam].chs.values()):
                 # channel.evaluate()
-                sns[tel_ind][cam_ind][ch_ind] = self._sns.ch_sensitivity(
-                    channel)
+                self._sns.ch_sensitivity(
+                    channel, out=sns[tel_ind, cam_ind, ch_ind])
         # Change telescope parameter
         elif str(tel) != '':
             tel_ind = list(exp.tels.keys()).index(tel)
@@ -157,8 +299,8 @@ class Vary:
                 for ch_ind, channel in enumerate(
                    camera.chs.values()):
                     # channel.evaluate()
-                    sns[tel_ind][cam_ind][ch_ind] = (
-                        self._sns.ch_sensitivity(channel))
+                    self._sns.ch_sensitivity(
+                        channel, out=sns[tel_ind, cam_ind, ch_ind])
         # Change experiment parameter
         else:
             for tel_ind, telescope in enumerate(
@@ -168,9 +310,48 @@ class Vary:
                     for ch_ind, channel in enumerate(
                        camera.chs.values()):
                         channel.evaluate()
-                        sns[tel_ind][cam_ind][ch_ind] = (
-                            self._sns.ch_sensitivity(channel))
-        return cp.deepcopy(sns)
+                        self._sns.ch_sensitivity(
+                            channel, out=sns[tel_ind, cam_ind, ch_ind])
+        return
+
+    def _update_sens(self, exp, sns, tel, cam, ch, params):
+        """
+        Re-sample only the changed parameters and recalculate only the
+        sensitivity stages downstream of them. The changed parameters are
+        redrawn from their own streams, so this matches re-evaluating the
+        experiment. Returns False without changing anything if any changed
+        parameter feeds the optical power.
+        """
+        if str(tel) == '':
+            return False
+        # Object which owns the changed parameters
+        tel_ind = list(exp.tels.keys()).index(tel)
+        obj = exp.tels[tel]
+        if str(cam) != '':
+            cam_ind = list(obj.cams.keys()).index(cam)
+            obj = obj.cams[cam]
+            if str(ch) != '':
+                ch_ind = list(obj.chs.keys()).index(ch)
+                obj = obj.chs[ch]
+        keys = [obj.param_key(param) for param in params]
+        if None in keys or not self._sns.updatable(keys):
+            return False
+        for key in keys:
+            obj.resample_param(key)
+        # Channels affected by the changed parameters
+        if str(cam) != '' and str(ch) != '':
+            inds = [(tel_ind, cam_ind, ch_ind, obj)]
+        elif str(cam) != '':
+            inds = [(tel_ind, cam_ind, k, channel)
+                    for k, channel in enumerate(obj.chs.values())]
+        else:
+            inds = [(tel_ind, j, k, channel)
+                    for j, camera in enumerate(obj.cams.values())
+                    for k, channel in enumerate(camera.chs.values())]
+        for i, j, k, channel in inds:
+            self._sns.ch_sensitivity(
+                channel, changed=keys, out=sns[i, j, k])
+        return True
 
     def _set_new_pix_sz(self, cam, ch, tup):
         """ Set new pixel size for given camera and channel """
@@ -298,40 +479,111 @@ class Vary:
             changed = self._set_new_pix_sz(cam, ch, (i, j))
         return changed
 
-    def _vary_exp(self, exp, sns, n, ntot):
-        """ Set new parameter combinations for defined experiment """
-        # Sensitivity for every parameter combination
-        sns_arr = []
-        # Loop over long-form data
-        for i in range(len(self._set_arr)):
-            self._status((n * len(self._set_arr) + i), ntot)
-            changes = []
-            # First adjust parameters
-            for j in range(len(self._set_arr[i])):
-                changed = self._set_new_param(exp, (i, j))
-                changes.append(changed)
-            # Where changes happened
-            changed_args = np.argwhere(changes).flatten()
-            chg_tels = self._tels[changed_args]
-            chg_cams = self._cams[changed_args]
-            chg_chs = self._chs[changed_args]
-            chg_opts = self._opts[changed_args]
-            # Only account for unique changes
-            chgs = np.array([chg_tels, chg_cams, chg_chs, chg_opts]).T
-            # If no changes occurred, move to the next parameter step
-            if len(chgs) == 0:
-                sns_arr.append(cp.deepcopy(sns))
-                continue
-            unique_chgs = np.unique(chgs, axis=0)
-            # Store new sensitivity values
-            for unique_chg in unique_chgs:
-                out_sns = self._adjust_sens(exp, sns, *unique_chg)
-            sns_arr.append(out_sns)
-        return sns_arr
+    def _vary_chunk(self, n, start, stop, out=None):
+        """
+        Evaluate parameter sets 'start' through 'stop' - 1 for experiment
+        realization 'n'. Every parameter set draws from the streams of the
+        realization, such that its outputs depend only on the realization
+        and the set, and not on how sets are grouped into units.
+
+        Args:
+        n (int): experiment realization
+        start (int): first parameter set
+        stop (int): last parameter set + 1
+        out (np.array): array shaped (stop - start, ntel, ncam, nch, nparam,
+        nsamples) to write the sensitivities into. Defaults to None, which
+        allocates a new array.
+        """
+        if out is None:
+            out = np.full((stop - start,) + self._sns_shape, np.nan)
+        exp = self._exp
+        # Evaluate the realization with the first parameter set applied
+        for j in range(len(self._set_arr[start])):
+            self._set_new_param(exp, (start, j))
+        self._plan.set_realization(n)
+        self._sim.seed_rngs(self._plan.seed(()))
+        exp.evaluate()
+        self._sns.sensitivity(exp, out=out[0])
+        # Adjust the remaining parameter sets, whose re-evaluated objects
+        # draw the same values as a full evaluation would
+        for i in range(start + 1, stop):
+            self._vary_exp(exp, out[i - start - 1], out[i - start], i)
+        self._log.flush()
+        return out
+
+    def _unit_out(self, n, start, stop):
+        """ View of the output array for realization 'n' and sets """
+        return self.adj_sns[
+            start:stop, ..., n * self._nsamp:(n + 1) * self._nsamp]
+
+    def _vary_pool(self, units, jobs):
+        """ Evaluate work units over a process pool """
+        global _worker_vary
+        self._log.log(
+            "Evaluating parameter sets over %d processes" % (jobs))
+        # Each forked worker owns a copy of the Experiment object
+        _worker_vary = self
+        self._log.flush()
+        ctx = mp.get_context("fork")
+        # The parent evaluates the last unit alongside jobs - 1 workers,
+        # which hand their log messages back rather than sharing the log
+        # file handle
+        with ctx.Pool(jobs - 1, initializer=_init_worker) as pool:
+            try:
+                outs = pool.imap(_vary_worker, units[:-1])
+                # The parent Experiment then holds the same state as in a
+                # serial run
+                self._vary_chunk(*units[-1], out=self._unit_out(*units[-1]))
+                # Results arrive in work unit order
+                for k, (out, msgs) in enumerate(outs):
+                    self._log.replay(msgs)
+                    self._status(k, len(units))
+                    self._unit_out(*units[k])[...] = out
+            except Exception as err:
+                self._log.replay(getattr(err, "log_msgs", []))
+                raise
+        _worker_vary = None
+        return
+
+    def _vary_exp(self, exp, prev_sns, sns, i):
+        """
+        Set parameter combination 'i' for defined experiment
+
+        Args:
+        exp (src.Experiment): evaluated Experiment object
+        prev_sns (np.array): sensitivities for the previous parameter set
+        sns (np.array): sensitivities to write for this parameter set
+        i (int): parameter set index
+        """
+        # Start from the previous sensitivities, changed where needed
+        sns[...] = prev_sns
+        changes = []
+        # First adjust parameters
+        for j in range(len(self._set_arr[i])):
+            changed = self._set_new_param(exp, (i, j))
+            changes.append(changed)
+        # Where changes happened
+        changed_args = np.argwhere(changes).flatten()
+        chg_tels = self._tels[changed_args]
+        chg_cams = self._cams[changed_args]
+        chg_chs = self._chs[changed_args]
+        chg_opts = self._opts[changed_args]
+        # Only account for unique changes
+        chgs = np.array([chg_tels, chg_cams, chg_chs, chg_opts]).T
+        # If no changes occurred, keep the previous sensitivities
+        if len(chgs) == 0:
+            return
+        unique_chgs = np.unique(chgs, axis=0)
+        chg_params = self._params[changed_args]
+        # Store new sensitivity values
+        for unique_chg in unique_chgs:
+            params = chg_params[np.all(chgs == unique_chg, axis=1)]
+            self._adjust_sens(exp, sns, *unique_chg, params=params)
+        return
 
     def _save_param_iter(self, it):
         """ Save sensitiviy for this parameter iteration """
-        exp = self._exps[0]  # Just for retrieving names
+        exp = self._exp  # Just for retrieving names
         sns = self.adj_sns[it]
         # Write output files for every channel
         if str(self._scope) != 'exp':  # Overall scope of vary